@@ -0,0 +1,124 @@
+import base64
+from datetime import date
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from .models import BookedNight
+
+MAX_MONTHS = 24
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def calendar_cache_key(room_pk):
+    return f"rooms:calendar:{room_pk}"
+
+
+def add_months(month, count):
+    """the first day of the month 'count' months after 'month'"""
+
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def encode_month(month, nights):
+    """encode the booked nights of a month as a base64 bitset
+
+    Keyword arguments:
+    month -- the first day of the month
+    nights -- the set of the booked dates
+    Return: base64 of the little-endian bitset, bit 'n' is set when day 'n + 1' is booked
+    """
+
+    days = (add_months(month, 1) - month).days
+    bits = 0
+
+    for day in range(days):
+        if month.replace(day=day + 1) in nights:
+            bits |= 1 << day
+
+    return base64.b64encode(bits.to_bytes(4, "little")).decode()
+
+
+def booked_nights(room_pk, start):
+    """the booked nights of a room in the MAX_MONTHS months from 'start'"""
+
+    return BookedNight.objects.filter(
+        room_id=room_pk,
+        night__gte=start,
+        night__lt=add_months(start, MAX_MONTHS),
+    ).values_list("night", flat=True)
+
+
+def encode_calendar(start, nights):
+    """the encoded calendar of MAX_MONTHS months from 'start'"""
+
+    return [
+        {
+            "month": add_months(start, count).strftime("%Y-%m"),
+            "booked": encode_month(add_months(start, count), nights),
+        }
+        for count in range(MAX_MONTHS)
+    ]
+
+
+def build_room_calendar(room_pk, start):
+    """the encoded calendar of MAX_MONTHS months from 'start', with one query"""
+
+    return encode_calendar(start, set(booked_nights(room_pk, start)))
+
+
+def get_room_calendar(room_pk, months):
+    """the booked nights of a room, month by month from the current month
+
+    the calendar of MAX_MONTHS months is cached per room until a booking of the room changes
+
+    Keyword arguments:
+    room_pk -- the pk of the room
+    months -- the number of the months to return (up to MAX_MONTHS)
+    Return: the list of {"month": "YYYY-MM", "booked": base64 bitset}
+    """
+
+    start = timezone.localtime(timezone.now()).date().replace(day=1)
+    key = calendar_cache_key(room_pk)
+    cached = cache.get(key)
+
+    # the cached calendar started in a past month
+    if cached is None or cached["start"] != start:
+        cached = {
+            "start": start,
+            "months": build_room_calendar(room_pk, start),
+        }
+        cache.set(key, cached, CACHE_TIMEOUT)
+
+    return cached["months"][:months]
+
+
+async def aget_room_calendar(room_pk, months):
+    """'get_room_calendar' for the async views, sharing the same cache"""
+
+    start = timezone.localtime(timezone.now()).date().replace(day=1)
+    key = calendar_cache_key(room_pk)
+    cached = await cache.aget(key)
+
+    if cached is None or cached["start"] != start:
+        nights = {night async for night in booked_nights(room_pk, start)}
+        cached = {
+            "start": start,
+            "months": encode_calendar(start, nights),
+        }
+        await cache.aset(key, cached, CACHE_TIMEOUT)
+
+    return cached["months"][:months]
+
+
+def clear_room_calendars(*room_pks):
+    """drop the cached calendars of the rooms
+
+    they are dropped right away and again after the commit,
+    so a calendar read while the transaction is running is not kept
+    """
+
+    keys = [calendar_cache_key(room_pk) for room_pk in room_pks if room_pk is not None]
+
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
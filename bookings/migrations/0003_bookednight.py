@@ -0,0 +1,86 @@
+# Generated by Django 4.1.13 on 2026-10-18 17:59
+
+from datetime import timedelta
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_booked_nights(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    BookedNight = apps.get_model("bookings", "BookedNight")
+
+    bookings = Booking.objects.filter(
+        kind="room",
+        room__isnull=False,
+        check_in__isnull=False,
+        check_out__isnull=False,
+    )
+
+    for booking in bookings.iterator():
+        BookedNight.objects.bulk_create(
+            [
+                BookedNight(
+                    booking=booking,
+                    room_id=booking.room_id,
+                    night=booking.check_in + timedelta(days=day),
+                )
+                for day in range((booking.check_out - booking.check_in).days)
+            ],
+            # overlapping bookings made before the index existed keep the first night
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0008_room_search_indexes"),
+        ("bookings", "0002_alter_booking_experience_alter_booking_room_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookedNight",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("night", models.DateField()),
+                (
+                    "booking",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="booked_nights",
+                        to="bookings.booking",
+                    ),
+                ),
+                (
+                    "room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="booked_nights",
+                        to="rooms.room",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="bookednight",
+            index=models.Index(
+                fields=["night", "room"], name="bookings_bo_night_5f1b87_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="bookednight",
+            constraint=models.UniqueConstraint(
+                fields=("room", "night"), name="unique_booked_night"
+            ),
+        ),
+        migrations.RunPython(fill_booked_nights, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.1.13 on 2026-10-18 17:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0003_bookednight"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["room", "check_in", "check_out"],
+                name="bookings_bo_room_id_9b7de4_idx",
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from datetime import timedelta
+from django.db import models, transaction
 from common.models import CommonModel
 
 
@@ -55,5 +56,73 @@ class Booking(CommonModel):
 
     guests = models.PositiveIntegerField()
 
+    class Meta:
+        indexes = [
+            # the overlap check of a new booking
+            models.Index(fields=["room", "check_in", "check_out"]),
+        ]
+
     def __str__(self) -> str:
         return f"{self.kind.title()} booking for: {self.user}"
+
+    def save(self, *args, **kwargs):
+        # the booked nights are written by signals,
+        # so they have to be committed together with the booking
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def nights(self):
+        """the dates of the nights between 'check_in' and 'check_out'
+
+        Return: the list of the dates (empty if it's not a room booking)
+        """
+
+        if (
+            self.kind != Booking.BookingKindChoices.ROOM
+            or self.room_id is None
+            or self.check_in is None
+            or self.check_out is None
+        ):
+            return []
+
+        return [
+            self.check_in + timedelta(days=day)
+            for day in range((self.check_out - self.check_in).days)
+        ]
+
+
+class BookedNight(models.Model):
+
+    """
+    BookedNight Model Definition
+    A night of a room taken by a booking, the occupancy index for availability search
+    """
+
+    booking = models.ForeignKey(
+        "bookings.Booking",
+        on_delete=models.CASCADE,
+        related_name="booked_nights",
+    )
+
+    room = models.ForeignKey(
+        "rooms.Room",
+        on_delete=models.CASCADE,
+        related_name="booked_nights",
+    )
+
+    night = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room", "night"],
+                name="unique_booked_night",
+            ),
+        ]
+        indexes = [
+            # the rooms taken in a date range, for the availability anti-join
+            models.Index(fields=["night", "room"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.room} / {self.night}"
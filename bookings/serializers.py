@@ -1,11 +1,16 @@
+import time
+from django.db import IntegrityError, OperationalError, transaction
 from django.utils import timezone
 from rest_framework import serializers
+from common.db import lock_row
+from rooms.models import Room
 from .models import Booking
 
 
 class CreateRoomBookingSerializer(serializers.ModelSerializer):
 
-    """the Booking serializer for handling user's request to create a booking for a room"""
+    """the Booking serializer for handling user's request to create a booking for a room
+    the room to book should be given as 'room' in the context"""
 
     check_in = serializers.DateField()
     check_out = serializers.DateField()
@@ -50,22 +55,76 @@ class CreateRoomBookingSerializer(serializers.ModelSerializer):
 
         return value
 
+    def is_taken(self, room, check_in, check_out):
+        """check whether the room has a booking overlapping [check_in, check_out)
+        (uses the (room, check_in, check_out) index of Booking)
+
+        Keyword arguments:
+        room -- the room to book
+        check_in -- the 'check_in' date of the new booking
+        check_out -- the 'check_out' date of the new booking
+        Return: True if some of the dates are already taken
+        """
+
+        return Booking.objects.filter(
+            room=room,
+            kind=Booking.BookingKindChoices.ROOM,
+            check_in__lt=check_out,
+            check_out__gt=check_in,
+        ).exists()
+
     def validate(self, data):
         if data["check_out"] <= data["check_in"]:
             raise serializers.ValidationError(
                 "Check In should be earlier than Check Out."
             )
 
-        if Booking.objects.filter(
-            check_in__lt=data["check_out"],
-            check_out__gt=data["check_in"],
-        ).exists():
+        if self.is_taken(self.context["room"], data["check_in"], data["check_out"]):
             raise serializers.ValidationError(
                 "Those (or some) of those dates are already taken."
             )
 
         return data
 
+    # the attempts of a booking losing the database lock to another one (SQLite)
+    LOCK_ATTEMPTS = 5
+
+    def create(self, validated_data):
+        """create the booking, safe against concurrent requests for the same room
+
+        the room is locked while checking again and inserting (see 'common.db.lock_row'),
+        and the unique (room, night) constraint of 'BookedNight' rejects any double booking left.
+        a booking still losing the lock after LOCK_ATTEMPTS attempts is rejected
+        """
+
+        room = validated_data["room"]
+        message = "Those (or some) of those dates are already taken."
+
+        for attempt in range(self.LOCK_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    lock_row(Room, room.pk)
+
+                    if self.is_taken(
+                        room,
+                        validated_data["check_in"],
+                        validated_data["check_out"],
+                    ):
+                        raise serializers.ValidationError(message)
+
+                    return super().create(validated_data)
+
+            except IntegrityError:
+                raise serializers.ValidationError(message)
+
+            except OperationalError:
+                # ex) "database is locked"
+                time.sleep(0.05 * (attempt + 1))
+
+        raise serializers.ValidationError(
+            "The room is being booked by someone else, please try again."
+        )
+
 
 class PublicBookingSerializer(serializers.ModelSerializer):
 
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .calendars import clear_room_calendars
+from .models import Booking, BookedNight
+
+
+@receiver(post_save, sender=Booking)
+def update_booked_nights(sender, instance, raw, **kwargs):
+    """rewrite the booked nights of a booking whenever it is saved
+    (the nights of a deleted booking are removed by the cascade)"""
+
+    if raw:
+        return
+
+    booked_nights = BookedNight.objects.filter(booking=instance)
+    previous_room_pks = set(booked_nights.values_list("room_id", flat=True))
+
+    booked_nights.delete()
+    BookedNight.objects.bulk_create(
+        [
+            BookedNight(
+                booking=instance,
+                room_id=instance.room_id,
+                night=night,
+            )
+            for night in instance.nights()
+        ]
+    )
+
+    clear_room_calendars(instance.room_id, *previous_room_pks)
+
+
+@receiver(post_delete, sender=Booking)
+def clear_calendar_on_delete(sender, instance, **kwargs):
+    clear_room_calendars(instance.room_id)
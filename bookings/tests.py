@@ -1,3 +1,130 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from common.testing import create_room
+from users.models import User
+from .models import Booking
 
-# Create your tests here.
+
+class TestRoomBookings(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="guest")
+        self.room = create_room(self.user)
+        self.today = timezone.localtime(timezone.now()).date()
+        self.client.force_authenticate(self.user)
+
+    def book(self, room, check_in, check_out):
+        return self.client.post(
+            f"/api/v1/rooms/{room.pk}/bookings",
+            {
+                "check_in": self.today + timedelta(days=check_in),
+                "check_out": self.today + timedelta(days=check_out),
+                "guests": 1,
+            },
+        )
+
+    def test_overlapping_booking(self):
+        self.assertIn("pk", self.book(self.room, 1, 4).json())
+        self.assertNotIn("pk", self.book(self.room, 3, 5).json())
+        self.assertIn("pk", self.book(self.room, 4, 5).json())
+
+    def test_booking_other_room(self):
+        other_room = create_room(self.user, name="Other Room")
+
+        self.assertIn("pk", self.book(self.room, 1, 4).json())
+        self.assertIn("pk", self.book(other_room, 1, 4).json())
+
+
+class TestConcurrentRoomBookings(TransactionTestCase):
+    THREADS = 8
+
+    def test_no_double_booking(self):
+        user = User.objects.create(username="guest")
+        room = create_room(user)
+        check_in = timezone.localtime(timezone.now()).date() + timedelta(days=1)
+        barrier = threading.Barrier(self.THREADS)
+        statuses = []
+
+        def book(offset):
+            client = APIClient()
+            client.force_authenticate(user)
+            barrier.wait()
+            try:
+                response = client.post(
+                    f"/api/v1/rooms/{room.pk}/bookings",
+                    {
+                        "check_in": check_in + timedelta(days=offset),
+                        "check_out": check_in + timedelta(days=offset + 2),
+                        "guests": 1,
+                    },
+                )
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        # every booking overlaps the next one
+        threads = [
+            threading.Thread(target=book, args=(offset % 2,))
+            for offset in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # booked, or rejected cleanly, never an error
+        self.assertEqual(len(statuses), self.THREADS)
+        self.assertTrue(set(statuses) <= {200, 400}, statuses)
+
+        bookings = list(Booking.objects.filter(room=room))
+        self.assertGreaterEqual(len(bookings), 1)
+        for booking in bookings:
+            for other in bookings:
+                if booking != other:
+                    self.assertFalse(
+                        booking.check_in < other.check_out
+                        and other.check_in < booking.check_out
+                    )
+
+
+class TestRoomCalendar(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="guest")
+        self.room = create_room(self.user)
+        self.url = f"/api/v1/rooms/{self.room.pk}/calendar"
+
+    def test_calendar(self):
+        first_day = timezone.localtime(timezone.now()).date().replace(day=1)
+        next_month = (first_day + timedelta(days=31)).replace(day=1)
+
+        self.assertEqual(len(self.client.get(self.url).json()), 12)
+
+        # the cached calendar is dropped by the new booking
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.room,
+            check_in=next_month + timedelta(days=1),
+            check_out=next_month + timedelta(days=3),
+            guests=1,
+        )
+
+        # the room and its booked nights, then only the room
+        with self.assertNumQueries(2):
+            calendar = self.client.get(self.url, {"months": 2}).json()
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {"months": 2})
+
+        self.assertEqual(calendar[0]["month"], first_day.strftime("%Y-%m"))
+        self.assertEqual(calendar[0]["booked"], "AAAAAA==")
+        # days 2 and 3 -> 0b110
+        self.assertEqual(calendar[1]["booked"], "BgAAAA==")
+
+    def test_calendar_invalid_months(self):
+        self.assertEqual(self.client.get(self.url, {"months": 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"months": "a"}).status_code, 400)
@@ -1,3 +1,13 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
+from common.testing import QueryCountGuard
+from .models import Category
 
-# Create your tests here.
+
+class TestCategoryQueries(QueryCountGuard, APITestCase):
+    def test_categories(self):
+        def create_category(index):
+            Category.objects.create(
+                name=f"Category {index}", kind=Category.CategoryKindChoices.ROOMS
+            )
+
+        self.assertQueriesDontGrow("/api/v1/categories/", create_category)
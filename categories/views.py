@@ -6,8 +6,18 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from .models import Category
 from .serializers import CategorySerializer
+from common.cache import cache_response
+from common.conditional import collection_validators, conditional_get
 
 
 class CategoryViewSet(ModelViewSet):
     serializer_class = CategorySerializer
     queryset = Category.objects.all()
+
+    def get_validators(self, request, *args, **kwargs):
+        return collection_validators(Category.objects.all())
+
+    @conditional_get(get_validators)
+    @cache_response("categories")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
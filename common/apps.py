@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "common"
+
+    def ready(self):
+        from .db import connect_sqlite_pragmas
+        from .signals import connect_response_cache
+
+        connect_response_cache()
+        connect_sqlite_pragmas()
@@ -0,0 +1,457 @@
+"""the API benchmark: a deterministic data generator and an in-process runner
+
+ex) DATABASE_NAME=bench.sqlite3 python manage.py migrate
+    DATABASE_NAME=bench.sqlite3 python manage.py seed_benchmark --scale 100k
+    DATABASE_NAME=bench.sqlite3 python manage.py benchmark -o before.json
+"""
+
+import io
+import random
+import statistics
+import time
+from datetime import date, time as day_time, timedelta
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from bookings.models import BookedNight, Booking
+from categories.models import Category
+from experiences.models import Experience, Perk
+from medias.models import Photo
+from reviews.models import Review
+from rooms.models import Amenity, Room
+from users.models import Token, User
+from wishlists.models import Wishlist
+
+# the number of the rooms of a scale, the other tables are sized from it
+SCALES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+BATCH_SIZE = 5000
+
+# the day the booking dates are counted from, so the rows don't depend on the day of the seeding
+EPOCH = date(2030, 1, 1)
+
+PLACES = (
+    ("Korea", "Seoul"),
+    ("Korea", "Busan"),
+    ("Japan", "Tokyo"),
+    ("Japan", "Osaka"),
+    ("France", "Paris"),
+    ("USA", "New York"),
+)
+
+# the endpoints of the benchmark, the placeholders are filled by 'get_fixtures'
+ENDPOINTS = (
+    "/api/v1/rooms/",
+    "/api/v1/rooms/?country=Korea&city=Seoul&min_price=100",
+    "/api/v1/rooms/{room}",
+    "/api/v1/rooms/{room}/reviews",
+    "/api/v1/rooms/{room}/amenities",
+    "/api/v1/rooms/{room}/calendar",
+    "/api/v1/rooms/amenities/",
+    "/api/v1/async/rooms/{room}",
+    "/api/v1/categories/",
+    "/api/v1/experiences/perks/",
+    "/api/v1/users/@{host}",
+    "/api/v1/users/@{host}/rooms",
+    "/api/v1/users/@{host}/reviews",
+    "/api/v1/wishlists/",
+)
+
+# the authentications of the requests of the benchmark, see 'config.authentication'
+AUTHS = ("session", "token", "trust-me")
+
+
+def batched(rows, batch_size=BATCH_SIZE):
+    batch = []
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def bulk_create(model, rows):
+    """insert the rows generated lazily, batch by batch"""
+
+    for batch in batched(rows):
+        model.objects.bulk_create(batch)
+
+
+def seed(scale, seed=0, start=EPOCH):
+    """fill an empty database with the same rows for the same 'scale' and 'seed'
+
+    the rows are inserted with 'bulk_create', which doesn't send the signals,
+    so the booked nights are inserted here and the review aggregates of the rooms
+    are rebuilt at the end with 'rebuild_room_ratings'
+
+    Keyword arguments:
+    scale -- the number of the rooms
+    seed -- the seed of the random generator
+    start -- the day the booking dates are counted from
+    Return: the number of the rows inserted per table
+    """
+
+    rng = random.Random(seed)
+
+    users = max(scale // 10, 10)
+    hosts = max(users // 2, 1)
+    experiences = max(scale // 10, 1)
+    bookings = scale // 2
+    wishlists = users // 2
+
+    with transaction.atomic():
+        bulk_create(
+            User,
+            (
+                User(
+                    username=f"user{i}",
+                    name=f"User {i}",
+                    password="!",
+                    is_host=i < hosts,
+                )
+                for i in range(users)
+            ),
+        )
+        user_pks = list(User.objects.order_by("pk").values_list("pk", flat=True))
+        host_pks = user_pks[:hosts]
+
+        Category.objects.bulk_create(
+            [
+                Category(name=f"Rooms {i}", kind=Category.CategoryKindChoices.ROOMS)
+                for i in range(5)
+            ]
+            + [
+                Category(
+                    name=f"Experiences {i}",
+                    kind=Category.CategoryKindChoices.EXPERIENCES,
+                )
+                for i in range(5)
+            ]
+        )
+        room_category_pks = list(
+            Category.objects.filter(kind=Category.CategoryKindChoices.ROOMS)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        experience_category_pks = list(
+            Category.objects.filter(kind=Category.CategoryKindChoices.EXPERIENCES)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        Amenity.objects.bulk_create([Amenity(name=f"Amenity {i}") for i in range(30)])
+        amenity_pks = list(Amenity.objects.order_by("pk").values_list("pk", flat=True))
+
+        Perk.objects.bulk_create(
+            [
+                Perk(name=f"Perk {i}", details="details", explanation="explanation")
+                for i in range(20)
+            ]
+        )
+        perk_pks = list(Perk.objects.order_by("pk").values_list("pk", flat=True))
+
+        def room_rows():
+            for i in range(scale):
+                country, city = rng.choice(PLACES)
+                yield Room(
+                    name=f"Room {i}",
+                    country=country,
+                    city=city,
+                    price=rng.randint(20, 500),
+                    rooms=rng.randint(1, 5),
+                    toilets=rng.randint(1, 3),
+                    description="description",
+                    address=f"{i} street",
+                    pet_friendly=rng.random() < 0.5,
+                    kind=rng.choice(Room.RoomKindChoices.values),
+                    owner_id=rng.choice(host_pks),
+                    category_id=rng.choice(room_category_pks),
+                )
+
+        bulk_create(Room, room_rows())
+        room_pks = list(Room.objects.order_by("pk").values_list("pk", flat=True))
+
+        bulk_create(
+            Room.amenities.through,
+            (
+                Room.amenities.through(room_id=room_pk, amenity_id=amenity_pk)
+                for room_pk in room_pks
+                for amenity_pk in rng.sample(amenity_pks, 3)
+            ),
+        )
+
+        bulk_create(
+            Photo,
+            (
+                Photo(
+                    file=f"https://example.com/{room_pk}/{i}.jpg",
+                    description=f"photo {i}",
+                    room_id=room_pk,
+                )
+                for room_pk in room_pks
+                for i in range(2)
+            ),
+        )
+
+        bulk_create(
+            Review,
+            (
+                Review(
+                    user_id=rng.choice(user_pks),
+                    room_id=room_pk,
+                    payload="review",
+                    rating=rng.randint(1, 5),
+                )
+                for room_pk in room_pks
+                for i in range(rng.randint(0, 6))
+            ),
+        )
+
+        def experience_rows():
+            for i in range(experiences):
+                country, city = rng.choice(PLACES)
+                yield Experience(
+                    name=f"Experience {i}",
+                    country=country,
+                    city=city,
+                    host_id=rng.choice(host_pks),
+                    price=rng.randint(10, 200),
+                    address=f"{i} avenue",
+                    start=day_time(10),
+                    end=day_time(12),
+                    description="description",
+                    category_id=rng.choice(experience_category_pks),
+                )
+
+        bulk_create(Experience, experience_rows())
+        experience_pks = list(
+            Experience.objects.order_by("pk").values_list("pk", flat=True)
+        )
+
+        bulk_create(
+            Experience.perks.through,
+            (
+                Experience.perks.through(experience_id=experience_pk, perk_id=perk_pk)
+                for experience_pk in experience_pks
+                for perk_pk in rng.sample(perk_pks, 2)
+            ),
+        )
+
+        # one booking per booked room, so the nights never overlap
+        def booking_rows():
+            for room_pk in room_pks[:bookings]:
+                check_in = start + timedelta(days=rng.randint(1, 300))
+                yield Booking(
+                    kind=Booking.BookingKindChoices.ROOM,
+                    user_id=rng.choice(user_pks),
+                    room_id=room_pk,
+                    check_in=check_in,
+                    check_out=check_in + timedelta(days=rng.randint(1, 5)),
+                    guests=rng.randint(1, 4),
+                )
+
+        bulk_create(Booking, booking_rows())
+        bulk_create(
+            BookedNight,
+            (
+                BookedNight(booking_id=booking_pk, room_id=room_pk, night=night)
+                for booking_pk, room_pk, check_in, check_out in Booking.objects.values_list(
+                    "pk", "room", "check_in", "check_out"
+                ).iterator()
+                for night in (
+                    check_in + timedelta(days=day)
+                    for day in range((check_out - check_in).days)
+                )
+            ),
+        )
+
+        bulk_create(
+            Wishlist,
+            (
+                Wishlist(name=f"Wishlist {i}", user_id=user_pks[i])
+                for i in range(wishlists)
+            ),
+        )
+        wishlist_pks = list(
+            Wishlist.objects.order_by("pk").values_list("pk", flat=True)
+        )
+
+        bulk_create(
+            Wishlist.rooms.through,
+            (
+                Wishlist.rooms.through(wishlist_id=wishlist_pk, room_id=room_pk)
+                for wishlist_pk in wishlist_pks
+                for room_pk in rng.sample(room_pks, min(5, len(room_pks)))
+            ),
+        )
+
+        call_command("rebuild_room_ratings", stdout=io.StringIO())
+
+    return {
+        model._meta.label: model.objects.count()
+        for model in (
+            User,
+            Category,
+            Amenity,
+            Perk,
+            Room,
+            Photo,
+            Review,
+            Experience,
+            Booking,
+            BookedNight,
+            Wishlist,
+        )
+    }
+
+
+def get_fixtures():
+    """the values of the placeholders of ENDPOINTS, and the user of the authenticated requests
+
+    Return: ({"room": pk, "host": username}, the user with a wishlist)
+    """
+
+    room = Room.objects.order_by("-review_count", "pk").first()
+    wishlist = Wishlist.objects.select_related("user").order_by("pk").first()
+
+    if room is None or wishlist is None:
+        return None, None
+
+    return {"room": room.pk, "host": room.owner.username}, wishlist.user
+
+
+def measure(client, path, requests, warmup):
+    """request 'path' 'requests' times after 'warmup' requests
+
+    Return: the report of the endpoint (latencies in ms)
+    """
+
+    for i in range(warmup):
+        client.get(path)
+
+    latencies = []
+    queries = []
+    statuses = set()
+
+    started = time.perf_counter()
+
+    for i in range(requests):
+        with CaptureQueriesContext(connection) as context:
+            request_started = time.perf_counter()
+            response = client.get(path)
+            latencies.append((time.perf_counter() - request_started) * 1000)
+        queries.append(len(context.captured_queries))
+        statuses.add(response.status_code)
+
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    # the 1st..99th percentiles
+    percentiles = (
+        statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    )
+
+    return {
+        "endpoint": path,
+        "requests": requests,
+        "statuses": sorted(statuses),
+        "throughput": round(requests / elapsed, 1),
+        "p50_ms": round(percentiles[49], 2),
+        "p95_ms": round(percentiles[94], 2),
+        "p99_ms": round(percentiles[98], 2),
+        "queries": statistics.median(queries),
+        "max_queries": max(queries),
+    }
+
+
+def get_client(user, auth):
+    """the test client sending the requests as the user
+
+    Keyword arguments:
+    user -- the user of the requests
+    auth -- "session" (the session cookie), "token" (a new API token)
+            or "trust-me" (the 'trust-me' header)
+    Return: (the client, the token to delete after the run or None)
+    """
+
+    if auth == "token":
+        token, key = Token.issue(user)
+        return Client(HTTP_AUTHORIZATION=f"Token {key}"), token
+
+    if auth == "trust-me":
+        return Client(HTTP_TRUST_ME=user.username), None
+
+    client = Client()
+    client.force_login(user)
+    return client, None
+
+
+def run(endpoints=ENDPOINTS, requests=200, warmup=10, auth="session"):
+    """drive the URLconf in-process with the Django test client
+
+    Keyword arguments:
+    endpoints -- the paths to request, with the placeholders of 'get_fixtures'
+    requests -- the number of the measured requests per endpoint
+    warmup -- the number of the requests before measuring (they fill the caches)
+    auth -- the authentication of the requests, one of AUTHS
+    Return: the list of the reports of the endpoints
+    """
+
+    if auth not in AUTHS:
+        raise ValueError(f"the authentication should be one of {', '.join(AUTHS)}")
+
+    fixtures, user = get_fixtures()
+    if fixtures is None:
+        raise ValueError("the database has no rooms or wishlists, run 'seed_benchmark'")
+
+    client, token = get_client(user, auth)
+
+    try:
+        return [
+            measure(client, endpoint.format(**fixtures), requests, warmup)
+            for endpoint in endpoints
+        ]
+    finally:
+        if token is not None:
+            token.delete()
+
+
+def compare(baseline, results):
+    """the change of the results from the baseline, per endpoint in both
+
+    Return: the list of {"endpoint", "p50_ms", "p95_ms", "queries"} with the differences in percent
+    (the queries as a difference of counts)
+    """
+
+    baseline = {report["endpoint"]: report for report in baseline}
+    changes = []
+
+    for report in results:
+        before = baseline.get(report["endpoint"])
+        if before is None:
+            continue
+
+        changes.append(
+            {
+                "endpoint": report["endpoint"],
+                "p50_ms": percent(before["p50_ms"], report["p50_ms"]),
+                "p95_ms": percent(before["p95_ms"], report["p95_ms"]),
+                "queries": report["queries"] - before["queries"],
+            }
+        )
+
+    return changes
+
+
+def percent(before, after):
+    if not before:
+        return 0.0
+    return round((after - before) / before * 100, 1)
@@ -0,0 +1,171 @@
+import hashlib
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+KEY_PREFIX = "response-cache"
+HIT = "hit"
+MISS = "miss"
+
+
+def get_response_cache():
+    """the cache backend for the responses (any Django cache backend: locmem, file, redis...)"""
+
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def version_key(namespace):
+    return f"{KEY_PREFIX}:version:{namespace}"
+
+
+def stats_key(namespace, result):
+    return f"{KEY_PREFIX}:stats:{namespace}:{result}"
+
+
+def new_version():
+    """the first version of a namespace, unique so the versions from before
+    the namespace was evicted (or the cache restarted) are never reused"""
+
+    return time.time_ns()
+
+
+def get_versions(namespaces):
+    """the current versions of the namespaces, fetched in one round trip"""
+
+    cache = get_response_cache()
+    keys = [version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+
+    if missing:
+        for key in missing:
+            cache.add(key, new_version(), None)
+        versions.update(cache.get_many(missing))
+
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_versions(namespaces):
+    cache = get_response_cache()
+
+    for namespace in namespaces:
+        try:
+            cache.incr(version_key(namespace))
+        except ValueError:
+            # the version doesn't exist yet (or was evicted)
+            cache.set(version_key(namespace), new_version(), None)
+
+
+def invalidate(*namespaces):
+    """invalidate every cached response of the namespaces
+
+    the responses are not deleted one by one,
+    the version of the namespaces is part of the cache key and is bumped instead.
+    it's bumped right away and again after the commit,
+    so a response cached while the transaction is running is not kept
+
+    Keyword arguments:
+    namespaces -- the names of the namespaces ex) "rooms", "amenities"
+    """
+
+    bump_versions(namespaces)
+    transaction.on_commit(lambda: bump_versions(namespaces))
+
+
+def record(namespace, result):
+    """count a hit or a miss of the namespace in the cache itself,
+    so the numbers are shared by every worker"""
+
+    cache = get_response_cache()
+    key = stats_key(namespace, result)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_stats(namespaces):
+    """the hits and misses counted for the namespaces
+
+    Return: {namespace: {"hit": int, "miss": int}}
+    """
+
+    cache = get_response_cache()
+    keys = {
+        (namespace, result): stats_key(namespace, result)
+        for namespace in namespaces
+        for result in (HIT, MISS)
+    }
+    values = cache.get_many(keys.values())
+    stats = {namespace: {HIT: 0, MISS: 0} for namespace in namespaces}
+
+    for (namespace, result), key in keys.items():
+        stats[namespace][result] = values.get(key, 0)
+
+    return stats
+
+
+def build_key(namespaces, request, per_user):
+    """the cache key: the versions of the namespaces + the full url (+ the user)"""
+
+    versions = get_versions(namespaces)
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    key = ":".join(
+        [KEY_PREFIX, "-".join(namespaces), *map(str, versions), path],
+    )
+
+    if per_user:
+        key += f":user-{request.user.pk or 'anonymous'}"
+
+    return key
+
+
+def cache_response(*namespaces, per_user=False):
+    """cache the data of the successful responses of a 'GET' handler
+
+    the data is served again without touching the database until
+    the namespaces are invalidated (see 'common.signals') or the timeout is over.
+    the responses have a 'X-Cache: HIT' or 'X-Cache: MISS' header.
+    a namespace can have the placeholders of the url kwargs and of the user,
+    to be invalidated per row ex) "rooms:{pk}", "likes:{user}"
+    ex) @cache_response("rooms", "rooms:{pk}", per_user=True)
+
+    Keyword arguments:
+    namespaces -- the namespaces the response depends on, the hits and misses are counted for the first
+    per_user -- True if the response depends on the user who requests
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            cache = get_response_cache()
+            key = build_key(
+                [
+                    namespace.format(user=request.user.pk or "anonymous", **kwargs)
+                    for namespace in namespaces
+                ],
+                request,
+                per_user,
+            )
+            data = cache.get(key)
+
+            if data is not None:
+                record(namespaces[0], HIT)
+                return Response(data, headers={"X-Cache": "HIT"})
+
+            response = handler(self, request, *args, **kwargs)
+            record(namespaces[0], MISS)
+
+            if response.status_code == 200:
+                cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+
+            response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,111 @@
+import hashlib
+from functools import wraps
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from .cache import get_versions
+
+
+def latest(*timestamps):
+    """the latest of the timestamps, ignoring None"""
+
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(timestamps) if timestamps else None
+
+
+def collection_validators(queryset, *related):
+    """the validators of a collection, computed in one aggregate query
+
+    'MAX(updated_at)' changes when an object is created or updated,
+    and the count changes when one is deleted.
+    a deletion doesn't move 'MAX(updated_at)', so there's no last modified datetime
+
+    Keyword arguments:
+    queryset -- the objects of the collection
+    related -- the lookups of the related 'updated_at' to take into account
+               ex) "photos__updated_at"
+    Return: (the parts of the ETag, None)
+    """
+
+    aggregates = queryset.order_by().aggregate(
+        count=Count("pk", distinct=True),
+        updated_at=Max("updated_at"),
+        **{f"related_{index}": Max(lookup) for index, lookup in enumerate(related)},
+    )
+    updated_at = latest(
+        aggregates["updated_at"],
+        *[aggregates[f"related_{index}"] for index in range(len(related))],
+    )
+
+    return (aggregates["count"], updated_at), None
+
+
+def namespace_validators(*namespaces):
+    """the validators of a response from the versions of the response cache namespaces
+    it depends on (bumped by 'common.signals'), without querying the database
+
+    Keyword arguments:
+    namespaces -- the namespaces ex) "room-list", "likes:<user pk>"
+    Return: (the parts of the ETag, None)
+    """
+
+    return get_versions(namespaces), None
+
+
+def make_etag(request, parts):
+    """a weak ETag of the parts, the full url and the user"""
+
+    value = ":".join(
+        map(str, [request.get_full_path(), request.user.pk, *parts]),
+    )
+    return "W/" + quote_etag(hashlib.md5(value.encode()).hexdigest())
+
+
+def conditional_get(get_validators):
+    """answer conditional 'GET' requests (If-None-Match, If-Modified-Since)
+    with '304 Not Modified' before the handler runs, so nothing is serialized
+
+    ex) @conditional_get(lambda view, request: collection_validators(Perk.objects.all()))
+
+    Keyword arguments:
+    get_validators -- called with the arguments of the handler,
+                      returns (the parts of the ETag, the last modified datetime)
+                      or None if the object doesn't exist.
+                      the last modified datetime should be None unless every change
+                      of the response moves it (ex) not with a count, the liked rooms or
+                      the owner in the parts), otherwise 'If-Modified-Since' would answer
+                      304 for a changed response, only the ETag is used then
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            validators = get_validators(self, request, *args, **kwargs)
+
+            # let the handler answer (ex. 404)
+            if validators is None:
+                return handler(self, request, *args, **kwargs)
+
+            parts, last_modified = validators
+            etag = make_etag(request, parts)
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(
+                request,
+                etag=etag,
+                last_modified=timestamp,
+            )
+
+            if response is None:
+                response = handler(self, request, *args, **kwargs)
+
+            if response.status_code in (200, 304):
+                response["ETag"] = etag
+                if timestamp is not None:
+                    response["Last-Modified"] = http_date(timestamp)
+
+            return response
+
+        return wrapper
+
+    return decorator
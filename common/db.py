@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.db.models import F
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """run 'SQLITE_PRAGMAS' on a new SQLite connection
+
+    WAL lets the readers run while a writer commits, and 'synchronous=NORMAL'
+    is safe with WAL (a commit is only lost on a power failure, not on a crash)
+    """
+
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def connect_sqlite_pragmas():
+    connection_created.connect(apply_sqlite_pragmas, dispatch_uid="sqlite_pragmas")
+
+
+def lock_row(model, pk):
+    """lock the row of a 'CommonModel' until the end of the transaction,
+    before reading what is about to be changed
+
+    SQLite has no row locks ('select_for_update' does nothing), so the write lock
+    of the database is taken with a no-op write before reading,
+    instead of failing to upgrade the read lock at the write ("database is locked")
+
+    Keyword arguments:
+    model -- the model of the row
+    pk -- the pk of the row
+    """
+
+    if connection.vendor == "sqlite":
+        model.objects.filter(pk=pk).update(updated_at=F("updated_at"))
+    else:
+        list(model.objects.select_for_update().filter(pk=pk).values_list("pk"))
@@ -0,0 +1,142 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+# the exported models and columns
+EXPORTS = {
+    "rooms": (
+        "rooms.Room",
+        (
+            "id",
+            "created_at",
+            "updated_at",
+            "name",
+            "country",
+            "city",
+            "price",
+            "rooms",
+            "toilets",
+            "description",
+            "address",
+            "pet_friendly",
+            "kind",
+            "owner_id",
+            "category_id",
+            "review_count",
+            "rating_sum",
+        ),
+    ),
+    "bookings": (
+        "bookings.Booking",
+        (
+            "id",
+            "created_at",
+            "updated_at",
+            "kind",
+            "user_id",
+            "room_id",
+            "experience_id",
+            "check_in",
+            "check_out",
+            "experience_time",
+            "guests",
+        ),
+    ),
+    "reviews": (
+        "reviews.Review",
+        (
+            "id",
+            "created_at",
+            "updated_at",
+            "user_id",
+            "room_id",
+            "experience_id",
+            "payload",
+            "rating",
+        ),
+    ),
+}
+
+FORMATS = ("ndjson", "csv")
+CHUNK_SIZE = 2000
+
+
+def parse_date(value, name):
+    """parse a 'YYYY-MM-DD' date, raises ValueError with a message for the user"""
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"'{name}' should be a date like 'YYYY-MM-DD'")
+
+
+def start_of_day(day):
+    """the aware datetime of the start of the day in the current time zone"""
+
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def export_rows(name, since=None, until=None, after=None, chunk_size=CHUNK_SIZE):
+    """the rows of an export, read in chunks in the order of 'id'
+
+    nothing but the current chunk is kept in memory ('values()' with 'iterator()'),
+    and an interrupted export is resumed with the 'id' of the last row as 'after'
+
+    Keyword arguments:
+    name -- the name of the export ("rooms", "bookings" or "reviews")
+    since -- only the rows created on or after this date
+    until -- only the rows created before this date
+    after -- only the rows with an 'id' greater than this (the keyset cursor)
+    chunk_size -- the number of the rows fetched at once
+    Return: a generator of the rows as dicts
+    """
+
+    model, fields = EXPORTS[name]
+    queryset = apps.get_model(model).objects.all()
+
+    # compared with the column itself (not its date) so the index of the rooms on 'created_at'
+    # can be used (the bookings and the reviews are scanned in the order of their 'id')
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=start_of_day(since))
+    if until is not None:
+        queryset = queryset.filter(created_at__lt=start_of_day(until))
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+
+    return queryset.order_by("pk").values(*fields).iterator(chunk_size=chunk_size)
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def csv_lines(rows, fields):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # only the header if there's no row
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+def export_lines(name, output, **filters):
+    """the lines of an export in NDJSON or CSV, see 'export_rows' for the filters"""
+
+    rows = export_rows(name, **filters)
+
+    if output == "csv":
+        return csv_lines(rows, EXPORTS[name][1])
+
+    return ndjson_lines(rows)
@@ -0,0 +1,85 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+from common.benchmarks import AUTHS, ENDPOINTS, compare, run
+
+
+class Command(BaseCommand):
+    """request the endpoints in-process with the Django test client and report the latencies
+    ex) python manage.py benchmark -o before.json --label main
+        python manage.py benchmark -o after.json --compare before.json
+        python manage.py benchmark --endpoint "/api/v1/rooms/{room}" --requests 1000
+        python manage.py benchmark --auth token -o token.json --compare before.json
+    """
+
+    help = "Benchmark the API endpoints in-process (throughput, p50/p95/p99, queries)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            help="the path to request, can be repeated (default: every endpoint)",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument(
+            "--auth",
+            choices=AUTHS,
+            default="session",
+            help="the authentication of the requests (default: session)",
+        )
+        parser.add_argument("--label", default="", help="ex) the commit")
+        parser.add_argument("-o", "--output", help="the JSON file of the results")
+        parser.add_argument("--compare", help="the JSON file of the baseline results")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("'--requests' should be positive")
+
+        # allows the host of the test client
+        setup_test_environment()
+
+        try:
+            results = run(
+                endpoints=options["endpoints"] or ENDPOINTS,
+                requests=options["requests"],
+                warmup=options["warmup"],
+                auth=options["auth"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for report in results:
+            self.stdout.write(
+                "{endpoint}\n"
+                "    {throughput} req/s, p50 {p50_ms}ms, p95 {p95_ms}ms, p99 {p99_ms}ms, "
+                "{queries} queries, status {statuses}".format(**report)
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "label": options["label"],
+                        "auth": options["auth"],
+                        "created_at": timezone.now().isoformat(),
+                        "results": results,
+                    },
+                    file,
+                    indent=2,
+                )
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as file:
+                baseline = json.load(file)["results"]
+
+            self.stdout.write("\nchanges from the baseline")
+            for change in compare(baseline, results):
+                self.stdout.write(
+                    "{endpoint}\n"
+                    "    p50 {p50_ms:+}%, p95 {p95_ms:+}%, queries {queries:+}".format(
+                        **change
+                    )
+                )
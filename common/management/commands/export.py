@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from common.exports import CHUNK_SIZE, EXPORTS, FORMATS, export_lines, parse_date
+
+
+class Command(BaseCommand):
+    """export the rows of rooms, bookings or reviews as NDJSON or CSV
+    ex) python manage.py export rooms > rooms.ndjson
+    ex) python manage.py export bookings --format csv --since 2023-01-01 -o bookings.csv
+    ex) python manage.py export reviews --after 1500 >> reviews.ndjson (resuming)
+    """
+
+    help = "Stream rooms, bookings or reviews as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=EXPORTS.keys())
+        parser.add_argument("--format", choices=FORMATS, default="ndjson")
+        parser.add_argument("--since", help="created on or after YYYY-MM-DD")
+        parser.add_argument("--until", help="created before YYYY-MM-DD")
+        parser.add_argument("--after", type=int, help="the id of the last exported row")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument(
+            "-o", "--output", help="the file to write (default: stdout)"
+        )
+
+    def handle(self, *args, **options):
+        filters = {
+            "after": options["after"],
+            "chunk_size": options["chunk_size"],
+        }
+
+        try:
+            for name in ("since", "until"):
+                if options[name]:
+                    filters[name] = parse_date(options[name], name)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        lines = export_lines(options["name"], options["format"], **filters)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                file.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
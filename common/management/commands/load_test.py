@@ -0,0 +1,101 @@
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """load a running server with concurrent GET requests, to compare the WSGI and the ASGI paths
+    ex) uvicorn config.asgi:application --workers 4
+        python manage.py load_test /api/v1/async/rooms/1 /api/v1/rooms/1 --concurrency 200
+    ex) gunicorn config.wsgi --workers 4 --threads 8
+        python manage.py load_test /api/v1/rooms/1 --requests 10000 --json
+    """
+
+    help = "Load a running server with concurrent GET requests and report the latencies"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="+", help="the paths to request, one run per path"
+        )
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument(
+            "--json", action="store_true", help="print the results as JSON"
+        )
+
+    def request(self, url, timeout):
+        """one GET request
+
+        Return: (the latency in seconds, whether the status was 2xx)
+        """
+
+        started = time.perf_counter()
+
+        try:
+            with urlopen(url, timeout=timeout) as response:
+                response.read()
+                ok = 200 <= response.status < 300
+        except (HTTPError, URLError, OSError):
+            ok = False
+
+        return time.perf_counter() - started, ok
+
+    def run(self, url, requests, concurrency, timeout):
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(
+                executor.map(lambda _: self.request(url, timeout), range(requests))
+            )
+
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for latency, ok in results)
+        # the 1st..99th percentiles
+        percentiles = (
+            statistics.quantiles(latencies, n=100)
+            if len(latencies) > 1
+            else latencies * 99
+        )
+
+        return {
+            "url": url,
+            "requests": requests,
+            "concurrency": concurrency,
+            "errors": sum(not ok for latency, ok in results),
+            "throughput": round(requests / elapsed, 1),
+            "p50_ms": round(percentiles[49] * 1000, 2),
+            "p95_ms": round(percentiles[94] * 1000, 2),
+            "p99_ms": round(percentiles[98] * 1000, 2),
+        }
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("'--requests' and '--concurrency' should be positive")
+
+        reports = [
+            self.run(
+                options["base_url"].rstrip("/") + path,
+                options["requests"],
+                options["concurrency"],
+                options["timeout"],
+            )
+            for path in options["paths"]
+        ]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(reports, indent=2))
+            return
+
+        for report in reports:
+            self.stdout.write(
+                "{url}: {throughput} req/s, p50 {p50_ms}ms, p95 {p95_ms}ms, p99 {p99_ms}ms, "
+                "{errors} errors ({requests} requests, {concurrency} concurrent)".format(
+                    **report
+                )
+            )
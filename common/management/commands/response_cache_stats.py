@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from common.cache import get_stats
+
+NAMESPACES = ("rooms", "amenities", "perks", "categories")
+
+
+class Command(BaseCommand):
+    """print the hits and misses of the response cache
+    ex) python manage.py response_cache_stats
+
+    the numbers are kept in the cache backend,
+    so they are only shared with the server when the backend is (file, redis...)
+    """
+
+    help = "Print the hit/miss metrics of the response cache"
+
+    def handle(self, *args, **options):
+        for namespace, stats in get_stats(NAMESPACES).items():
+            total = stats["hit"] + stats["miss"]
+            ratio = stats["hit"] / total if total else 0
+
+            self.stdout.write(
+                f"{namespace:<12} hit {stats['hit']:>8}  miss {stats['miss']:>8}  "
+                f"ratio {ratio:.1%}"
+            )
@@ -0,0 +1,38 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from common.benchmarks import EPOCH, SCALES, seed
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    """fill an empty database with the deterministic rows of the benchmark
+    ex) DATABASE_NAME=bench.sqlite3 python manage.py migrate
+        DATABASE_NAME=bench.sqlite3 python manage.py seed_benchmark --scale 100k
+        DATABASE_NAME=bench.sqlite3 python manage.py seed_benchmark --start 2024-06-01
+    """
+
+    help = "Fill an empty database with the seeded rows of the benchmark"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=SCALES.keys(), default="1k")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--start",
+            type=date.fromisoformat,
+            default=EPOCH,
+            help=f"the day the booking dates are counted from (default: {EPOCH})",
+        )
+
+    def handle(self, *args, **options):
+        if Room.objects.exists():
+            raise CommandError(
+                "The database already has rooms, seed an empty database "
+                "(ex) DATABASE_NAME=bench.sqlite3 python manage.py migrate)"
+            )
+
+        counts = seed(
+            SCALES[options["scale"]], seed=options["seed"], start=options["start"]
+        )
+
+        for label, count in counts.items():
+            self.stdout.write(f"{label:<24} {count:>10}")
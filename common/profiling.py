@@ -0,0 +1,225 @@
+import statistics
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from rest_framework.serializers import BaseSerializer
+
+# the upper bounds (ms) of the buckets of the latency histogram, the last bucket has no bound
+BUCKETS = (10, 25, 50, 100, 250, 500, 1000)
+
+
+class RouteStats:
+    """the rolling window of the samples of the requests, per URL pattern
+
+    a sample is (total ms, app ms, sql ms, serializer ms, queries, response bytes).
+    only the last 'window' samples of a route are kept, so the numbers follow the current code
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def add(self, route, sample):
+        with self.lock:
+            samples = self.samples.get(route)
+            if samples is None:
+                samples = self.samples[route] = deque(maxlen=self.window)
+            samples.append(sample)
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+    def summarize(self, route, samples):
+        totals = sorted(sample[0] for sample in samples)
+        percentiles = (
+            statistics.quantiles(totals, n=100) if len(totals) > 1 else totals * 99
+        )
+
+        histogram = {f"<={bound}ms": 0 for bound in BUCKETS}
+        histogram[f">{BUCKETS[-1]}ms"] = 0
+        for total in totals:
+            bound = next((bound for bound in BUCKETS if total <= bound), None)
+            histogram[f"<={bound}ms" if bound else f">{BUCKETS[-1]}ms"] += 1
+
+        return {
+            "route": route,
+            "requests": len(samples),
+            "p50_ms": round(percentiles[49], 2),
+            "p95_ms": round(percentiles[94], 2),
+            "max_ms": round(totals[-1], 2),
+            "app_ms": round(statistics.mean(sample[1] for sample in samples), 2),
+            "sql_ms": round(statistics.mean(sample[2] for sample in samples), 2),
+            "serializer_ms": round(statistics.mean(sample[3] for sample in samples), 2),
+            "queries": round(statistics.mean(sample[4] for sample in samples), 1),
+            "max_queries": max(sample[4] for sample in samples),
+            "bytes": round(statistics.mean(sample[5] for sample in samples)),
+            "histogram": histogram,
+        }
+
+    def report(self, sort="p95_ms", limit=20):
+        """the routes with the highest 'sort' (ex) "p95_ms", "queries", "serializer_ms")
+
+        Return: the list of the summaries of the routes
+        """
+
+        with self.lock:
+            samples = {
+                route: list(route_samples)
+                for route, route_samples in self.samples.items()
+            }
+
+        summaries = [
+            self.summarize(route, route_samples)
+            for route, route_samples in samples.items()
+        ]
+        summaries.sort(key=lambda summary: summary[sort], reverse=True)
+        return summaries[:limit]
+
+
+route_stats = RouteStats(settings.PROFILING_WINDOW)
+
+
+class QueryTimer:
+    """the execute wrapper counting the queries of a request and their time"""
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.queries += 1
+
+
+# the serializer timer of the current request, set by 'ProfilingMiddleware'
+serializer_timer = ContextVar("serializer_timer", default=None)
+
+
+class SerializerTimer:
+    """the time spent in the 'data' of the serializers of a request, out of their SQL queries
+
+    only the outermost serializer is timed,
+    the serializers rendered inside another one (ex) a 'SerializerMethodField') are part of it
+    """
+
+    def __init__(self, query_timer):
+        self.query_timer = query_timer
+        self.duration = 0.0
+        self.depth = 0
+
+    def __enter__(self):
+        self.depth += 1
+        if self.depth == 1:
+            self.started = time.perf_counter()
+            self.sql_started = self.query_timer.duration
+
+    def __exit__(self, *exc_info):
+        self.depth -= 1
+        if self.depth == 0:
+            sql = self.query_timer.duration - self.sql_started
+            self.duration += time.perf_counter() - self.started - sql
+
+
+class SerializerPatch:
+    """time the 'data' of every DRF serializer with the timer of the current request,
+    only while a profiled request is running
+
+    'BaseSerializer.data' is replaced by the first profiled request
+    and restored by the last one, so nothing is left patched outside of them
+    (the 'data' of 'Serializer' and 'ListSerializer' both call the one of 'BaseSerializer')
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.original = None
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        with self.lock:
+            if self.requests == 0:
+                self.original = BaseSerializer.data
+                BaseSerializer.data = property(self.timed(self.original.fget))
+            self.requests += 1
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.requests -= 1
+            if self.requests == 0:
+                BaseSerializer.data = self.original
+                self.original = None
+
+    @staticmethod
+    def timed(data):
+        def timed_data(self):
+            timer = serializer_timer.get()
+
+            # a request of another thread, not profiled
+            if timer is None:
+                return data(self)
+
+            with timer:
+                return data(self)
+
+        return timed_data
+
+
+time_serializers = SerializerPatch()
+
+
+class ProfilingMiddleware:
+    """record the SQL queries, the SQL time, the serializer time, the time out of them
+    and the size of every response
+
+    they are sent back as 'Server-Timing' (shown by the browser dev tools)
+    and kept per URL pattern in 'route_stats', see 'GET /api/v1/profiling'.
+    only used when 'PROFILING' is on, ex) PROFILING=true python manage.py runserver
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        serializers = SerializerTimer(timer)
+        token = serializer_timer.set(serializers)
+        started = time.perf_counter()
+
+        try:
+            with time_serializers, connection.execute_wrapper(timer):
+                response = self.get_response(request)
+        finally:
+            serializer_timer.reset(token)
+
+        total = (time.perf_counter() - started) * 1000
+        sql = timer.duration * 1000
+        serializer = serializers.duration * 1000
+        # the view and the rendering
+        app = total - sql - serializer
+        size = 0 if response.streaming else len(response.content)
+
+        response["Server-Timing"] = (
+            f'sql;dur={sql:.2f};desc="{timer.queries} queries", '
+            f"serializer;dur={serializer:.2f}, "
+            f"app;dur={app:.2f}, total;dur={total:.2f}"
+        )
+
+        match = request.resolver_match
+        if match is not None:
+            route_stats.add(
+                match.route, (total, app, sql, serializer, timer.queries, size)
+            )
+
+        return response
@@ -0,0 +1,133 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from .cache import invalidate
+
+# the fields of the owner and the reviewers shown by the room detail
+OWNER_FIELDS = {"username", "name", "avatar"}
+
+
+def room_detail(*room_pks):
+    """the namespaces of the cached details of the rooms"""
+
+    return [f"rooms:{pk}" for pk in room_pks if pk is not None]
+
+
+def review_rooms(review):
+    """the room of the review, and its previous room when it was moved"""
+
+    previous = getattr(review, "_previous", None)
+    return room_detail(review.room_id, previous[0] if previous else None)
+
+
+def shown_rooms(user, update_fields=None, **kwargs):
+    """the rooms showing the user as their owner or in their latest reviews,
+    only when the shown fields are saved (not on the 'last_login' save of a login)"""
+
+    if kwargs.get("created") or (
+        update_fields is not None and not OWNER_FIELDS & set(update_fields)
+    ):
+        return []
+
+    owned = user.rooms.values_list("pk", flat=True)
+    reviewed = user.reviews.values_list("room", flat=True).distinct()
+    return room_detail(*{*owned, *reviewed})
+
+
+# the cached response namespaces depending on each model,
+# a tuple, or a function of the instance (and the signal kwargs) for the namespaces per row.
+# "rooms" is every room detail and list, "rooms:<pk>" one room detail,
+# "room-list" the rows of the room lists (the ETag of the room list and the wishlists),
+# "likes:<user pk>" the wishlists of one user (and 'is_liked'),
+# "wishlists" the wishlists of every user
+# (the public profiles are cached per user by 'users.profiles')
+DEPENDENCIES = {
+    "rooms.Room": lambda room, **kwargs: ["room-list", *room_detail(room.pk)],
+    "rooms.Amenity": ("amenities", "rooms"),
+    "experiences.Perk": ("perks",),
+    # counted in the summary of the wishlists
+    "experiences.Experience": ("wishlists",),
+    "categories.Category": ("categories", "rooms"),
+    "medias.Photo": lambda photo, **kwargs: ["room-list", *room_detail(photo.room_id)],
+    "reviews.Review": lambda review, **kwargs: ["room-list", *review_rooms(review)],
+    # the available rooms of a search
+    "bookings.Booking": ("room-list",),
+    "users.User": shown_rooms,
+    "wishlists.Wishlist": lambda wishlist, **kwargs: [f"likes:{wishlist.user_id}"],
+}
+
+
+def changed_amenities(instance, reverse, pk_set, **kwargs):
+    # room.amenities.add(...)
+    if not reverse:
+        return ["room-list", *room_detail(instance.pk)]
+
+    # amenity.rooms.clear() doesn't tell the rooms
+    if pk_set is None:
+        return ["rooms"]
+
+    return ["room-list", *room_detail(*pk_set)]
+
+
+def changed_likes(instance, reverse, **kwargs):
+    # wishlist.rooms.add(...)
+    if not reverse:
+        return [f"likes:{instance.user_id}"]
+
+    # room.wishlists.add(...), the users are not known
+    return ["wishlists", *room_detail(instance.pk)]
+
+
+def changed_wishlist_experiences(instance, reverse, **kwargs):
+    # wishlist.experiences.add(...)
+    if not reverse:
+        return [f"likes:{instance.user_id}"]
+
+    # experience.wishlists.add(...)
+    return ["wishlists"]
+
+
+M2M_DEPENDENCIES = {
+    "rooms.Room_amenities": changed_amenities,
+    "wishlists.Wishlist_rooms": changed_likes,
+    "wishlists.Wishlist_experiences": changed_wishlist_experiences,
+}
+
+
+def invalidate_on(signal, name, sender, namespaces):
+    """invalidate the namespaces whenever the signal is sent by the sender
+
+    Keyword arguments:
+    signal -- post_save, post_delete or m2m_changed
+    name -- the name of the signal, for the dispatch uid
+    sender -- the model as "app_label.ModelName"
+    namespaces -- the response cache namespaces to invalidate,
+                  or the function returning them from the instance and the signal kwargs
+    """
+
+    def receiver(instance, raw=False, action="post_", **kwargs):
+        # fixtures, and the 'pre_' actions of m2m_changed
+        if raw or not action.startswith("post_"):
+            return
+
+        if callable(namespaces):
+            changed = namespaces(instance, **kwargs)
+        else:
+            changed = namespaces
+
+        if changed:
+            invalidate(*changed)
+
+    signal.connect(
+        receiver,
+        sender=sender,
+        weak=False,
+        dispatch_uid=f"response-cache:{name}:{sender}",
+    )
+
+
+def connect_response_cache():
+    for sender, namespaces in DEPENDENCIES.items():
+        invalidate_on(post_save, "save", sender, namespaces)
+        invalidate_on(post_delete, "delete", sender, namespaces)
+
+    for sender, namespaces in M2M_DEPENDENCIES.items():
+        invalidate_on(m2m_changed, "m2m", sender, namespaces)
@@ -0,0 +1,88 @@
+from contextlib import ExitStack
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rooms.models import Room
+
+# the numbers of the rows rendered by 'assertQueriesDontGrow'
+PAGE_SIZES = (1, 50)
+
+
+def create_room(owner, **overrides):
+    """create a room of the owner with the required fields filled
+
+    Keyword arguments:
+    owner -- the owner of the room
+    overrides -- the fields to set instead of the defaults ex) name="Hanok", price=200
+    Return: the room
+    """
+
+    fields = {
+        "name": "Room",
+        "price": 100,
+        "rooms": 1,
+        "toilets": 1,
+        "description": "description",
+        "address": "address",
+        "kind": Room.RoomKindChoices.ENTIRE_PLACE,
+        **overrides,
+    }
+    return Room.objects.create(owner=owner, **fields)
+
+
+class QueryCountGuard:
+    """the mixin of the API test cases catching the N+1 queries of the list endpoints
+
+    ex)
+    class TestRoomQueries(QueryCountGuard, APITestCase):
+        def test_rooms(self):
+            self.assertQueriesDontGrow("/api/v1/rooms/", self.create_room, RoomPagination)
+    """
+
+    def count_queries(self, url):
+        """the number of the queries of 'GET url', with the response cache empty"""
+
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200, url)
+        return len(context.captured_queries)
+
+    def assertQueriesDontGrow(self, url, create_row, *paginations, sizes=PAGE_SIZES):
+        """render 'url' with each of 'sizes' rows on one page, and fail when the
+        number of the queries is not the same for every size
+
+        Keyword arguments:
+        url -- the list endpoint
+        create_row -- the function creating one more row of the list, called with its index
+        paginations -- the pagination classes of the endpoint, their page size is set to the size
+        sizes -- the numbers of the rows to render
+        """
+
+        counts = {}
+        rows = 0
+
+        for size in sizes:
+            while rows < size:
+                create_row(rows)
+                rows += 1
+
+            with ExitStack() as stack:
+                for pagination in paginations:
+                    stack.enter_context(
+                        mock.patch.object(pagination, "page_size", size)
+                    )
+
+                counts[size] = self.count_queries(url)
+
+        self.assertEqual(
+            len(set(counts.values())),
+            1,
+            f"the queries of {url} grow with the rows "
+            + ", ".join(
+                f"({size} rows: {count} queries)" for size, count in counts.items()
+            ),
+        )
@@ -1,3 +1,216 @@
-from django.test import TestCase
+import io
+import json
+import time
+from datetime import timedelta
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APITestCase
+from .benchmarks import EPOCH, run, seed
+from .profiling import route_stats
+from .testing import create_room
+from bookings.models import Booking
+from users.models import Token, User
+from rooms.models import Amenity, Room
 
-# Create your tests here.
+
+class TestResponseCache(APITestCase):
+    URL = "/api/v1/rooms/amenities/"
+
+    def setUp(self):
+        cache.clear()
+        Amenity.objects.create(name="Wifi")
+
+    def test_cached_until_invalidated(self):
+        response = self.client.get(self.URL)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        # only the validators of the conditional request
+        with self.assertNumQueries(1):
+            response = self.client.get(self.URL)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(len(response.json()), 1)
+
+        Amenity.objects.create(name="Kitchen")
+
+        response = self.client.get(self.URL)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.json()), 2)
+
+
+class TestConditionalGet(APITestCase):
+    URL = "/api/v1/rooms/amenities/"
+
+    def setUp(self):
+        Amenity.objects.create(name="Wifi")
+
+    def test_not_modified(self):
+        response = self.client.get(self.URL)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_deleted_since(self):
+        # no 'Last-Modified', a deletion doesn't change 'MAX(updated_at)'
+        self.assertNotIn("Last-Modified", self.client.get(self.URL))
+
+        Amenity.objects.create(name="Kitchen").delete()
+
+        response = self.client.get(
+            self.URL, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_modified(self):
+        etag = self.client.get(self.URL)["ETag"]
+
+        Amenity.objects.all().delete()
+
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+
+class TestExport(APITestCase):
+    URL = "/api/v1/exports/rooms"
+
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_staff=True)
+        self.rooms = [create_room(self.admin, name=f"Room {i}") for i in range(3)]
+        self.client.force_authenticate(self.admin)
+
+    def export(self, **params):
+        response = self.client.get(self.URL, params)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        rows = [json.loads(line) for line in self.export().splitlines()]
+
+        self.assertEqual([row["name"] for row in rows], ["Room 0", "Room 1", "Room 2"])
+
+        rows = [
+            json.loads(line) for line in self.export(after=rows[0]["id"]).splitlines()
+        ]
+        self.assertEqual(len(rows), 2)
+
+    def test_export_created_between(self):
+        today = timezone.localdate()
+        tomorrow = today + timedelta(days=1)
+
+        self.assertEqual(len(self.export(since=today, until=tomorrow).splitlines()), 3)
+        self.assertEqual(self.export(until=today), "")
+        self.assertEqual(self.export(since=tomorrow), "")
+
+    def test_export_csv(self):
+        lines = self.export(output="csv").splitlines()
+
+        self.assertTrue(lines[0].startswith("id,created_at"))
+        self.assertEqual(len(lines), 4)
+
+    def test_export_command(self):
+        stdout = io.StringIO()
+        call_command("export", "rooms", "--format", "csv", stdout=stdout)
+
+        self.assertEqual(len(stdout.getvalue().splitlines()), 4)
+
+    def test_export_admin_only(self):
+        self.client.force_authenticate(User.objects.create(username="user"))
+
+        self.assertEqual(self.client.get(self.URL).status_code, 403)
+
+
+class TestSQLitePragmas(SimpleTestCase):
+    databases = {"default"}
+
+    def test_pragmas_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            # NORMAL
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+@override_settings(PROFILING=True)
+class TestProfiling(APITestCase):
+    URL = "/api/v1/profiling"
+
+    def setUp(self):
+        cache.clear()
+        route_stats.clear()
+        Amenity.objects.create(name="Wifi")
+
+    def test_server_timing(self):
+        response = self.client.get("/api/v1/rooms/amenities/")
+
+        self.assertIn('queries", serializer;dur=', response["Server-Timing"])
+        self.assertIn("app;dur=", response["Server-Timing"])
+
+    def test_serializers_restored(self):
+        data = BaseSerializer.data
+
+        self.client.get("/api/v1/rooms/amenities/")
+
+        # only patched during the profiled request
+        self.assertIs(BaseSerializer.data, data)
+
+    def test_report(self):
+        for i in range(3):
+            self.client.get("/api/v1/rooms/amenities/")
+        self.client.get("/api/v1/rooms/1")
+
+        self.client.force_authenticate(
+            User.objects.create(username="admin", is_staff=True)
+        )
+        report = self.client.get(self.URL, {"sort": "serializer_ms"}).json()
+        amenities = next(
+            summary
+            for summary in report
+            if summary["route"] == "api/v1/rooms/amenities/"
+        )
+
+        self.assertEqual(
+            {summary["route"] for summary in report},
+            {"api/v1/rooms/amenities/", "api/v1/rooms/<int:pk>"},
+        )
+        self.assertEqual(amenities["requests"], 3)
+        self.assertGreater(amenities["serializer_ms"], 0)
+        self.assertEqual(sum(amenities["histogram"].values()), 3)
+
+        self.assertEqual(self.client.get(self.URL, {"sort": "name"}).status_code, 400)
+
+    def test_admin_only(self):
+        self.assertEqual(self.client.get(self.URL).status_code, 403)
+
+
+class TestBenchmark(APITestCase):
+    def test_seed_and_run(self):
+        counts = seed(20, seed=1)
+
+        self.assertEqual(counts["rooms.Room"], 20)
+        self.assertEqual(counts["bookings.Booking"], 10)
+        self.assertFalse(Booking.objects.filter(check_in__lte=EPOCH).exists())
+        self.assertEqual(
+            Room.objects.filter(review_count__gt=0).count(),
+            Room.objects.filter(reviews__isnull=False).distinct().count(),
+        )
+
+        results = run(requests=2, warmup=0)
+
+        for report in results:
+            self.assertEqual(report["statuses"], [200], report["endpoint"])
+            self.assertGreater(report["queries"], 0)
+
+        # the wishlists are only shown to an authenticated user
+        for auth in ("token", "trust-me"):
+            (report,) = run(
+                endpoints=["/api/v1/wishlists/"], requests=1, warmup=0, auth=auth
+            )
+            self.assertEqual(report["statuses"], [200], auth)
+
+        self.assertFalse(Token.objects.exists())
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import Export
+
+urlpatterns = [
+    path("<str:name>", Export.as_view()),
+]
@@ -1,3 +1,112 @@
-from django.shortcuts import render
+from django.http import StreamingHttpResponse
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.response import Response
+from rest_framework.status import HTTP_204_NO_CONTENT
+from .exports import EXPORTS, FORMATS, export_lines, parse_date
+from .profiling import route_stats
 
-# Create your views here.
+
+class Export(APIView):
+    """APIView for streaming the whole table of rooms, bookings or reviews to analytics"""
+
+    permission_classes = [IsAdminUser]
+
+    def get_filters(self, request):
+        """read the filters of the export from the query params
+
+        Keyword arguments:
+        request -- the request from user
+        Return: the keyword arguments of 'export_lines'
+        """
+
+        filters = {}
+
+        try:
+            for name in ("since", "until"):
+                if request.query_params.get(name):
+                    filters[name] = parse_date(request.query_params[name], name)
+        except ValueError as e:
+            raise ParseError(str(e))
+
+        after = request.query_params.get("after")
+        if after:
+            try:
+                filters["after"] = int(after)
+            except ValueError:
+                raise ParseError("'after' should be the id of the last exported row")
+
+        return filters
+
+    def get(self, request, name):
+        """GET request handler
+        ex) GET /exports/rooms
+        ex) GET /exports/bookings?output=csv&since=2023-01-01&until=2023-02-01
+        ex) GET /exports/reviews?after=1500 (resuming after the row with the id 1500)
+
+        Keyword arguments:
+        request -- the request from user
+        name -- "rooms", "bookings" or "reviews"
+        Return: the rows streamed as NDJSON (default) or CSV, in the order of 'id'
+        """
+
+        if name not in EXPORTS:
+            raise NotFound
+
+        # not '?format=', it's the content negotiation of DRF
+        output = request.query_params.get("output", "ndjson")
+        if output not in FORMATS:
+            raise ParseError(f"'output' should be one of {FORMATS}")
+
+        lines = export_lines(name, output, **self.get_filters(request))
+
+        response = StreamingHttpResponse(
+            lines,
+            content_type="text/csv" if output == "csv" else "application/x-ndjson",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{name}.{output}"'
+        return response
+
+
+class Profiling(APIView):
+    """APIView for the slowest endpoints recorded by 'common.profiling.ProfilingMiddleware'"""
+
+    permission_classes = [IsAdminUser]
+
+    SORTS = (
+        "p50_ms",
+        "p95_ms",
+        "max_ms",
+        "sql_ms",
+        "serializer_ms",
+        "queries",
+        "max_queries",
+        "bytes",
+    )
+
+    def get(self, request):
+        """GET request handler
+        ex) GET /api/v1/profiling?sort=queries&limit=10
+
+        Keyword arguments:
+        request -- get request from an admin
+        Return: the summaries of the URL patterns with the highest 'sort' (default: p95_ms)
+        """
+
+        sort = request.query_params.get("sort", "p95_ms")
+        if sort not in self.SORTS:
+            raise ParseError(f"'sort' should be one of {', '.join(self.SORTS)}")
+
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            raise ParseError("'limit' should be a number")
+
+        return Response(route_stats.report(sort=sort, limit=limit))
+
+    def delete(self, request):
+        """DELETE request handler to start over the recording"""
+
+        route_stats.clear()
+        return Response(status=HTTP_204_NO_CONTENT)
@@ -1,6 +1,12 @@
-from rest_framework.authentication import BaseAuthentication
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
 from rest_framework.exceptions import AuthenticationFailed
-from users.models import User
+from users.models import User, Token
 
 
 class TrustMeBroAuthentication(BaseAuthentication):
@@ -15,3 +21,139 @@ class TrustMeBroAuthentication(BaseAuthentication):
             return (user, None)
         except User.DoesNotExist:
             raise AuthenticationFailed(f"No user with {username}")
+
+
+def freeze(instance):
+    """the field values of a model instance, to build a new instance from"""
+
+    fields = [field.attname for field in instance._meta.concrete_fields]
+    return (
+        type(instance),
+        instance._state.db,
+        fields,
+        [getattr(instance, field) for field in fields],
+    )
+
+
+def thaw(frozen):
+    model, db, fields, values = frozen
+    return model.from_db(db, fields, values)
+
+
+class TokenCache:
+    """a bounded LRU cache of 'token digest -> (user, token)' with a TTL
+
+    the field values are cached, not the instances, and every 'get' builds new ones,
+    so a request changing its user doesn't change the user of the other requests.
+    the cache lives in the process, so a revoked token is evicted right away here
+    and after 'ttl' seconds at the latest in the other workers
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, digest):
+        with self.lock:
+            entry = self.entries.get(digest)
+
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[digest]
+                return None
+
+            self.entries.move_to_end(digest)
+
+        user_pk, user, token = value
+        user, token = thaw(user), thaw(token)
+        token.user = user
+        return user, token
+
+    def set(self, digest, value):
+        user, token = value
+        value = (user.pk, freeze(user), freeze(token))
+
+        with self.lock:
+            self.entries[digest] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(digest)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def evict(self, digest):
+        with self.lock:
+            self.entries.pop(digest, None)
+
+    def evict_user(self, user_pk):
+        with self.lock:
+            for digest, (expires_at, (pk, user, token)) in list(self.entries.items()):
+                if pk == user_pk:
+                    del self.entries[digest]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL,
+)
+
+
+class TokenAuthentication(BaseAuthentication):
+    """authenticate with the header 'Authorization: Token <token>'
+
+    the users of the recently used tokens are kept in 'token_cache',
+    so the hot paths don't query the user on every request
+    """
+
+    keyword = "Token"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise AuthenticationFailed("Invalid token header.")
+
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed("Invalid token header.")
+
+        digest = Token.hash(key)
+        cached = token_cache.get(digest)
+
+        if cached is not None:
+            return cached
+
+        try:
+            token = Token.objects.select_related("user").get(digest=digest)
+        except Token.DoesNotExist:
+            raise AuthenticationFailed("Invalid token.")
+
+        if not token.user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+
+        token_cache.set(digest, (token.user, token))
+        return (token.user, token)
+
+
+@receiver(post_delete, sender=Token)
+def evict_revoked_token(sender, instance, **kwargs):
+    token_cache.evict(instance.digest)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_changed_user(sender, instance, **kwargs):
+    # ex) a deactivated user or a changed password
+    token_cache.evict_user(instance.pk)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -58,6 +59,7 @@ SYSTEM_APPS = [
 INSTALLED_APPS = SYSTEM_APPS + CUSTOM_APPS + THIRD_PARTY_APPS
 
 MIDDLEWARE = [
+    "common.profiling.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -91,11 +93,58 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# the database is configured by the environment, ex) for production
+# DATABASE_ENGINE=postgres DATABASE_NAME=airbnb DATABASE_USER=... DATABASE_HOST=... (with the "postgres" extra: poetry install --extras postgres)
+
+
+def env_bool(name, default):
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes")
+
+
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite")
+
+if DATABASE_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DATABASE_NAME", "airbnb"),
+            "USER": os.environ.get("DATABASE_USER", "postgres"),
+            "PASSWORD": os.environ.get("DATABASE_PASSWORD", ""),
+            "HOST": os.environ.get("DATABASE_HOST", "127.0.0.1"),
+            "PORT": os.environ.get("DATABASE_PORT", "5432"),
+            # DATABASE_POOL=pgbouncer when the connections go through a PgBouncer pool
+            # in the transaction mode, which can't keep the server side cursors
+            # of '.iterator()' open between the transactions
+            "DISABLE_SERVER_SIDE_CURSORS": (
+                os.environ.get("DATABASE_POOL") == "pgbouncer"
+            ),
+        }
     }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DATABASE_NAME", BASE_DIR / "db.sqlite3"),
+            # seconds to wait for the lock of a writer
+            "OPTIONS": {"timeout": int(os.environ.get("DATABASE_TIMEOUT", 20))},
+            # a file, not the shared in-memory database, so the concurrent tests
+            # wait for the locks like the server does
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+        }
+    }
+
+# keep the connections open between the requests (seconds, 0 closes them after every request)
+# and check them before they are reused
+DATABASES["default"]["CONN_MAX_AGE"] = int(os.environ.get("DATABASE_CONN_MAX_AGE", 60))
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = env_bool(
+    "DATABASE_CONN_HEALTH_CHECKS", True
+)
+
+# the pragmas run on every new SQLite connection (see 'common.db')
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
 }
 
 
@@ -149,9 +198,33 @@ MEDIA_URL = "user-uploads/"
 
 PAGE_SIZE = 3
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# any backend works for the response cache, ex) the file based cache or
+# "django.core.cache.backends.redis.RedisCache" with "LOCATION": "redis://127.0.0.1:6379"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = 60 * 10
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "config.authentication.TokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "config.authentication.TrustMeBroAuthentication",
     ]
 }
+
+# the in-process cache of the token authentication
+TOKEN_CACHE_SIZE = 10000
+TOKEN_CACHE_TTL = 60
+
+# the query count and latency profiling of every request (see 'common.profiling'),
+# with the last PROFILING_WINDOW requests kept per URL pattern
+PROFILING = env_bool("PROFILING", False)
+PROFILING_WINDOW = 1000
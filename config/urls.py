@@ -17,14 +17,18 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf.urls.static import static
 from django.conf import settings
+from common.views import Profiling
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/rooms/", include("rooms.urls")),
+    path("api/v1/async/rooms/", include("rooms.async_urls")),
     path("api/v1/categories/", include("categories.urls")),
     path("api/v1/experiences/", include("experiences.urls")),
     path("api/v1/medias/", include("medias.urls")),
     path("api/v1/wishlists/", include("wishlists.urls")),
     path("api/v1/users/", include("users.urls")),
+    path("api/v1/exports/", include("common.urls")),
+    path("api/v1/profiling", Profiling.as_view()),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
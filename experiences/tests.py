@@ -1,3 +1,13 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
+from common.testing import QueryCountGuard
+from .models import Perk
 
-# Create your tests here.
+
+class TestPerkQueries(QueryCountGuard, APITestCase):
+    def test_perks(self):
+        def create_perk(index):
+            Perk.objects.create(
+                name=f"Perk {index}", details="details", explanation="explanation"
+            )
+
+        self.assertQueriesDontGrow("/api/v1/experiences/perks/", create_perk)
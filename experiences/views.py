@@ -4,6 +4,8 @@ from rest_framework.exceptions import NotFound
 from rest_framework.status import HTTP_204_NO_CONTENT
 from .models import Perk
 from .serializers import PerkSerializer
+from common.cache import cache_response
+from common.conditional import collection_validators, conditional_get
 
 
 class Perks(APIView):
@@ -12,6 +14,11 @@ class Perks(APIView):
     example : /api/v1/experiences/perks
     """
 
+    def get_validators(self, request):
+        return collection_validators(Perk.objects.all())
+
+    @conditional_get(get_validators)
+    @cache_response("perks")
     def get(self, request):
         all_perks = Perk.objects.all()
         serializer = PerkSerializer(all_perks, many=True)
@@ -0,0 +1,25 @@
+# Generated by Django 4.1.13 on 2026-10-18 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0002_alter_review_experience_alter_review_room_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["room", "created_at"], name="reviews_rev_room_id_60a6db_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["user", "created_at"], name="reviews_rev_user_id_35ef9b_idx"
+            ),
+        ),
+    ]
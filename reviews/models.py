@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from common.models import CommonModel
 
 
@@ -33,5 +33,18 @@ class Review(CommonModel):
 
     rating = models.PositiveIntegerField()
 
+    class Meta:
+        indexes = [
+            # keyset pagination of the reviews of a room or a user
+            models.Index(fields=["room", "created_at"]),
+            models.Index(fields=["user", "created_at"]),
+        ]
+
     def __str__(self) -> str:
         return f"{self.user} / {self.rating}"
+
+    def save(self, *args, **kwargs):
+        # the room rating aggregates are updated by signals,
+        # so they have to be committed together with the review
+        with transaction.atomic():
+            super().save(*args, **kwargs)
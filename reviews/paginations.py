@@ -1,5 +1,11 @@
-from rest_framework.pagination import PageNumberPagination
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
 
 
-class ReviewPagination(PageNumberPagination):
+class ReviewPagination(CursorPagination):
     page_size = 10
+    ordering = ("-created_at", "-pk")
+
+
+class RoomReviewPagination(ReviewPagination):
+    page_size = settings.PAGE_SIZE
@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from common.db import lock_row
+from rooms.models import Room
+from .models import Review
+
+
+def adjust_room_rating(room_pk, rating, delta):
+    """add (delta=1) or remove (delta=-1) a rating to/from the review summary of a room
+
+    the room is locked before its rating histogram is read (see 'common.db.lock_row'),
+    so concurrent reviews of the room don't lose a change of the histogram
+
+    Keyword arguments:
+    room_pk -- the pk of the room (nothing happens if it is None)
+    rating -- the rating of the review
+    delta -- 1 or -1
+    """
+
+    if room_pk is None:
+        return
+
+    with transaction.atomic():
+        lock_row(Room, room_pk)
+
+        histogram = (
+            Room.objects.filter(pk=room_pk)
+            .values_list("rating_histogram", flat=True)
+            .first()
+        )
+
+        if histogram is None:
+            return
+
+        key = str(rating)
+        histogram[key] = histogram.get(key, 0) + delta
+
+        if histogram[key] <= 0:
+            del histogram[key]
+
+        Room.objects.filter(pk=room_pk).update(
+            review_count=F("review_count") + delta,
+            rating_sum=F("rating_sum") + delta * rating,
+            rating_histogram=histogram,
+            updated_at=timezone.now(),
+        )
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_review(sender, instance, raw, **kwargs):
+    """keep the stored room/rating of a review that is about to be updated"""
+
+    instance._previous = None
+
+    if raw or instance.pk is None:
+        return
+
+    instance._previous = (
+        Review.objects.filter(pk=instance.pk).values_list("room", "rating").first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def update_room_rating_on_save(sender, instance, created, raw, **kwargs):
+    """add a new review to its room, or move an updated one between rooms/ratings"""
+
+    if raw:
+        return
+
+    previous = getattr(instance, "_previous", None)
+
+    if not created and previous is not None:
+        previous_room_pk, previous_rating = previous
+
+        if (previous_room_pk, previous_rating) == (instance.room_id, instance.rating):
+            return
+
+        adjust_room_rating(previous_room_pk, previous_rating, -1)
+
+    adjust_room_rating(instance.room_id, instance.rating, 1)
+
+
+@receiver(post_delete, sender=Review)
+def update_room_rating_on_delete(sender, instance, **kwargs):
+    """remove a deleted review from its room"""
+
+    adjust_room_rating(instance.room_id, instance.rating, -1)
@@ -1,3 +1,128 @@
-from django.test import TestCase
+import importlib
+import io
+import threading
+import time
+from unittest import mock
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Avg, Count, Sum
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from common.testing import create_room
+from rooms.models import Room
+from users.models import User
+from .models import Review
+from .signals import adjust_room_rating
 
-# Create your tests here.
+
+class TestRoomRatings(TestCase):
+    def setUp(self):
+        self.host = User.objects.create(username="host")
+        self.guest = User.objects.create(username="guest")
+        self.room = create_room(self.host)
+        self.other_room = create_room(self.host, name="Other Room")
+
+    def review(self, room, rating):
+        return Review.objects.create(
+            user=self.guest, room=room, payload="review", rating=rating
+        )
+
+    def assertStoredRatings(self):
+        """the stored aggregates of every room are the aggregates of its reviews"""
+
+        for room in Room.objects.all():
+            aggregates = Review.objects.filter(room=room).aggregate(
+                count=Count("pk"), total=Sum("rating"), average=Avg("rating")
+            )
+
+            self.assertEqual(room.review_count, aggregates["count"], room)
+            self.assertEqual(room.rating_sum, aggregates["total"] or 0, room)
+            self.assertEqual(room.rating(), round(aggregates["average"] or 0, 2), room)
+
+    def test_create_update_move_delete(self):
+        review = self.review(self.room, 5)
+        self.review(self.room, 2)
+        self.assertStoredRatings()
+
+        review.rating = 3
+        review.save()
+        self.assertStoredRatings()
+
+        review.room = self.other_room
+        review.save()
+        self.assertStoredRatings()
+
+        review.delete()
+        self.assertStoredRatings()
+
+    def test_rebuild_room_ratings(self):
+        self.review(self.room, 5)
+        self.review(self.room, 4)
+        self.review(self.other_room, 1)
+        Room.objects.update(review_count=9, rating_sum=9, rating_histogram={})
+
+        call_command("rebuild_room_ratings", stdout=io.StringIO())
+
+        self.assertStoredRatings()
+        self.assertEqual(
+            Room.objects.get(pk=self.room.pk).rating_histogram, {"5": 1, "4": 1}
+        )
+
+    def test_backfill_migration(self):
+        self.review(self.room, 5)
+        self.review(self.other_room, 2)
+        Room.objects.update(review_count=0, rating_sum=0)
+
+        migration = importlib.import_module(
+            "rooms.migrations.0006_room_review_count_room_rating_sum"
+        )
+        migration.fill_review_aggregates(apps, None)
+
+        self.assertStoredRatings()
+
+
+class TestConcurrentRatings(TransactionTestCase):
+    THREADS = 8
+
+    def test_no_lost_rating(self):
+        room = create_room(User.objects.create(username="host"))
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def add_rating(rating):
+            barrier.wait()
+            try:
+                adjust_room_rating(room.pk, rating, 1)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=add_rating, args=(index % 2 + 4,))
+            for index in range(self.THREADS)
+        ]
+
+        # widen the window between the read and the write of the histogram
+        now = timezone.now
+
+        def slow_now():
+            time.sleep(0.05)
+            return now()
+
+        with mock.patch("reviews.signals.timezone.now", slow_now):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        # every rating counted, never "database is locked"
+        self.assertEqual(errors, [])
+
+        room = Room.objects.get(pk=room.pk)
+        self.assertEqual(room.review_count, self.THREADS)
+        self.assertEqual(room.rating_sum, 4.5 * self.THREADS)
+        self.assertEqual(
+            room.rating_histogram, {"4": self.THREADS // 2, "5": self.THREADS // 2}
+        )
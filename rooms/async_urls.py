@@ -0,0 +1,11 @@
+from django.urls import path
+from . import async_views
+
+urlpatterns = [
+    path("", async_views.AsyncRooms.as_view()),
+    path("<int:pk>", async_views.AsyncRoomDetail.as_view()),
+    path("<int:pk>/reviews", async_views.AsyncRoomReviews.as_view()),
+    path("<int:pk>/amenities", async_views.AsyncRoomAmenities.as_view()),
+    path("<int:pk>/calendar", async_views.AsyncRoomCalendar.as_view()),
+    path("amenities/", async_views.AsyncAmenities.as_view()),
+]
@@ -0,0 +1,253 @@
+"""async variants of the read endpoints of the rooms, for the ASGI server
+
+DRF views are synchronous, so these are Django async views using the async ORM,
+and the DRF serializers are given rows that are already loaded.
+They are served under '/api/v1/async/rooms/' next to the synchronous views.
+
+the queries are awaited one after another: the async ORM of Django 4.1 runs
+every query in one shared thread ('thread_sensitive'), so gathering them
+wouldn't run them concurrently
+"""
+
+import base64
+from datetime import datetime
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.exceptions import APIException, NotFound, ParseError
+from rest_framework.utils.urls import replace_query_param
+from config.authentication import TokenAuthentication
+from bookings.calendars import MAX_MONTHS, aget_room_calendar
+from medias.models import Photo
+from reviews.models import Review
+from reviews.paginations import RoomReviewPagination
+from reviews.serializers import ReviewSerializer
+from wishlists.likes import aget_liked_room_pks
+from .filters import filter_rooms
+from .models import Amenity, Room
+from .paginations import AmenityPagination, RoomPagination
+from .serializers import (
+    AmenitiySerializer,
+    AsyncRoomDetailSerializer,
+    AsyncRoomListSerializer,
+)
+
+
+async def get_user(request):
+    """the user who requests, authenticated by the token or the session
+
+    Keyword arguments:
+    request -- the request from user
+    Return: the user, or None for an anonymous user
+    """
+
+    def authenticate():
+        result = TokenAuthentication().authenticate(request)
+        user = result[0] if result else request.user
+        return user if user.is_authenticated else None
+
+    return await sync_to_async(authenticate)()
+
+
+def encode_cursor(row):
+    position = f"{row.created_at.isoformat()}|{row.pk}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(pk)
+    except (TypeError, ValueError, UnicodeError):
+        raise NotFound("Invalid cursor")
+
+
+async def paginate(request, queryset, pagination):
+    """one page of the queryset, keyset paginated on ('created_at', 'pk')
+
+    Keyword arguments:
+    request -- the request from user, with the '?cursor=' of the page
+    queryset -- the queryset to paginate
+    pagination -- the DRF pagination class of the synchronous view (for the page size and the order)
+    Return: the rows of the page, and the url of the next page (None on the last page)
+    """
+
+    page_size = pagination.page_size
+    descending = pagination.ordering[0].startswith("-")
+    cursor = request.GET.get("cursor")
+
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        if descending:
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+            )
+        else:
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+            )
+
+    # one more row to know if there's a next page
+    rows = [
+        row async for row in queryset.order_by(*pagination.ordering)[: page_size + 1]
+    ]
+
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    next_url = replace_query_param(
+        request.build_absolute_uri(), "cursor", encode_cursor(rows[-1])
+    )
+    return rows, next_url
+
+
+async def alist(queryset):
+    return [row async for row in queryset]
+
+
+async def get_room(pk):
+    try:
+        return await Room.objects.select_related("owner", "category").aget(pk=pk)
+    except Room.DoesNotExist:
+        raise NotFound
+
+
+async def check_room(pk):
+    if not await Room.objects.filter(pk=pk).aexists():
+        raise NotFound
+
+
+class AsyncAPIView(View):
+    """the base of the async views, answering the DRF exceptions like DRF does"""
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return JsonResponse({"detail": exc.detail}, status=exc.status_code)
+
+
+class AsyncAmenities(AsyncAPIView):
+    """
+    async 'GET /api/v1/async/rooms/amenities'
+    """
+
+    async def get(self, request):
+        amenities = [amenity async for amenity in Amenity.objects.all().aiterator()]
+        serializer = AmenitiySerializer(amenities, many=True)
+        return JsonResponse(serializer.data, safe=False)
+
+
+class AsyncRooms(AsyncAPIView):
+    """
+    async 'GET /api/v1/async/rooms', with the search params of 'GET /api/v1/rooms'
+    """
+
+    async def get(self, request):
+        user = await get_user(request)
+        rooms = filter_rooms(Room.objects.all(), request.GET)
+        rooms, next_url = await paginate(request, rooms, RoomPagination)
+
+        photos = {}
+        async for photo in Photo.objects.filter(room__in=rooms):
+            photos.setdefault(photo.room_id, []).append(photo)
+
+        serializer = AsyncRoomListSerializer(
+            rooms,
+            many=True,
+            context={
+                "user": user,
+                "liked_room_pks": await aget_liked_room_pks(user),
+                "photos": photos,
+            },
+        )
+        return JsonResponse({"next": next_url, "results": serializer.data})
+
+
+class AsyncRoomDetail(AsyncAPIView):
+    """
+    async 'GET /api/v1/async/rooms/<pk>'
+    """
+
+    async def get(self, request, pk):
+        user = await get_user(request)
+        room = await get_room(pk)
+
+        # the related rows of the detail
+        photos = await alist(room.photos.all())
+        amenity_pks = await alist(room.amenities.values_list("pk", flat=True))
+        latest_reviews = await alist(
+            room.reviews.select_related("user").order_by("-created_at", "-pk")[
+                : AsyncRoomDetailSerializer.LATEST_REVIEWS
+            ]
+        )
+        liked_room_pks = await aget_liked_room_pks(user)
+
+        serializer = AsyncRoomDetailSerializer(
+            room,
+            context={
+                "user": user,
+                "is_liked": room.pk in liked_room_pks,
+                "photos": photos,
+                "amenity_pks": amenity_pks,
+                "latest_reviews": latest_reviews,
+            },
+        )
+        return JsonResponse(serializer.data)
+
+
+class AsyncRoomReviews(AsyncAPIView):
+    """
+    async 'GET /api/v1/async/rooms/<pk>/reviews'
+    """
+
+    async def get(self, request, pk):
+        await check_room(pk)
+
+        reviews, next_url = await paginate(
+            request,
+            Review.objects.filter(room=pk).select_related("user"),
+            RoomReviewPagination,
+        )
+
+        serializer = ReviewSerializer(reviews, many=True)
+        return JsonResponse({"next": next_url, "results": serializer.data})
+
+
+class AsyncRoomAmenities(AsyncAPIView):
+    """
+    async 'GET /api/v1/async/rooms/<pk>/amenities'
+    """
+
+    async def get(self, request, pk):
+        await check_room(pk)
+
+        amenities, next_url = await paginate(
+            request,
+            Amenity.objects.filter(rooms=pk),
+            AmenityPagination,
+        )
+
+        serializer = AmenitiySerializer(amenities, many=True)
+        return JsonResponse({"next": next_url, "results": serializer.data})
+
+
+class AsyncRoomCalendar(AsyncAPIView):
+    """
+    async 'GET /api/v1/async/rooms/<pk>/calendar?months=12'
+    """
+
+    async def get(self, request, pk):
+        try:
+            months = int(request.GET.get("months", 12))
+        except ValueError:
+            raise ParseError("'months' should be a number")
+
+        if not 1 <= months <= MAX_MONTHS:
+            raise ParseError(f"'months' should be between 1 and {MAX_MONTHS}")
+
+        await check_room(pk)
+
+        return JsonResponse(await aget_room_calendar(pk, months), safe=False)
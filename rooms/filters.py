@@ -0,0 +1,144 @@
+from datetime import date
+from django.db.models import Count
+from rest_framework.exceptions import ParseError
+from bookings.models import BookedNight
+from .models import Room
+
+
+def get_positive_int(query_params, name):
+    """read a positive integer from the query params
+
+    Keyword arguments:
+    query_params -- the query params of the request
+    name -- the name of the query param
+    Return: the integer, or None if the param is not given
+    """
+
+    value = query_params.get(name)
+
+    if value in (None, ""):
+        return None
+
+    try:
+        value = int(value)
+    except ValueError:
+        raise ParseError(f"'{name}' should be a number")
+
+    if value < 0:
+        raise ParseError(f"'{name}' should be a positive number")
+
+    return value
+
+
+def get_amenity_pks(query_params):
+    """read the amenity 'pk's from '?amenities=1,2,3'
+
+    Keyword arguments:
+    query_params -- the query params of the request
+    Return: the set of the amenity pks (empty if the param is not given)
+    """
+
+    value = query_params.get("amenities")
+
+    if not value:
+        return set()
+
+    try:
+        return {int(pk) for pk in value.split(",") if pk}
+    except ValueError:
+        raise ParseError("'amenities' should be comma separated numbers")
+
+
+def get_date(query_params, name):
+    """read a 'YYYY-MM-DD' date from the query params
+
+    Keyword arguments:
+    query_params -- the query params of the request
+    name -- the name of the query param
+    Return: the date, or None if the param is not given
+    """
+
+    value = query_params.get(name)
+
+    if not value:
+        return None
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ParseError(f"'{name}' should be a date like 'YYYY-MM-DD'")
+
+
+def filter_rooms(rooms, query_params):
+    """filter rooms with the search query params
+    ex) /api/v1/rooms/?city=Seoul&min_price=50&max_price=200&amenities=1,4
+    ex) /api/v1/rooms/?city=Seoul&check_in=2023-05-01&check_out=2023-05-04
+
+    Keyword arguments:
+    rooms -- the queryset of the rooms to filter
+    query_params -- the query params of the request
+    Return: the filtered queryset
+    """
+
+    # exact matches, so the (city, price) / (country, city, kind) indexes can be used
+    for field in ("country", "city"):
+        value = query_params.get(field)
+        if value:
+            rooms = rooms.filter(**{field: value})
+
+    kind = query_params.get("kind")
+    if kind:
+        if kind not in Room.RoomKindChoices.values:
+            raise ParseError(f"'kind' should be one of {Room.RoomKindChoices.values}")
+        rooms = rooms.filter(kind=kind)
+
+    pet_friendly = query_params.get("pet_friendly")
+    if pet_friendly:
+        if pet_friendly not in ("true", "false"):
+            raise ParseError("'pet_friendly' should be 'true' or 'false'")
+        rooms = rooms.filter(pet_friendly=pet_friendly == "true")
+
+    min_price = get_positive_int(query_params, "min_price")
+    if min_price is not None:
+        rooms = rooms.filter(price__gte=min_price)
+
+    max_price = get_positive_int(query_params, "max_price")
+    if max_price is not None:
+        rooms = rooms.filter(price__lte=max_price)
+
+    # 'rooms' and 'toilets' are the minimum numbers a guest needs
+    for field in ("rooms", "toilets"):
+        value = get_positive_int(query_params, field)
+        if value is not None:
+            rooms = rooms.filter(**{f"{field}__gte": value})
+
+    # rooms having all of the amenities:
+    # group the (room, amenity) rows of the wanted amenities by room in one subquery
+    # and keep the rooms matching every one of them, instead of joining once per amenity
+    amenity_pks = get_amenity_pks(query_params)
+    if amenity_pks:
+        rooms_with_amenities = (
+            Room.amenities.through.objects.filter(amenity_id__in=amenity_pks)
+            .values("room_id")
+            .annotate(matched=Count("amenity_id"))
+            .filter(matched=len(amenity_pks))
+            .values("room_id")
+        )
+        rooms = rooms.filter(pk__in=rooms_with_amenities)
+
+    # available rooms: an anti-join against the nights taken in [check_in, check_out)
+    check_in = get_date(query_params, "check_in")
+    check_out = get_date(query_params, "check_out")
+    if check_in or check_out:
+        if not check_in or not check_out:
+            raise ParseError("'check_in' and 'check_out' should be given together")
+        if check_out <= check_in:
+            raise ParseError("Check In should be earlier than Check Out.")
+
+        taken_rooms = BookedNight.objects.filter(
+            night__gte=check_in,
+            night__lt=check_out,
+        ).values("room_id")
+        rooms = rooms.exclude(pk__in=taken_rooms)
+
+    return rooms
@@ -0,0 +1,211 @@
+import csv
+import json
+from django.db import transaction
+from rest_framework import serializers
+from categories.models import Category
+from medias.models import Photo
+from users.profiles import clear_public_profiles
+from .models import Amenity, Room
+
+
+class RoomImportSerializer(serializers.Serializer):
+    """the validation of a row of the room import
+    'category' and 'amenities' are names, 'photos' are urls"""
+
+    name = serializers.CharField(max_length=180)
+    country = serializers.CharField(max_length=50, required=False)
+    city = serializers.CharField(max_length=80, required=False)
+    price = serializers.IntegerField(min_value=0)
+    rooms = serializers.IntegerField(min_value=0)
+    toilets = serializers.IntegerField(min_value=0)
+    description = serializers.CharField(allow_blank=True)
+    address = serializers.CharField(max_length=250)
+    pet_friendly = serializers.BooleanField(required=False)
+    kind = serializers.ChoiceField(choices=Room.RoomKindChoices.choices)
+    category = serializers.CharField(required=False, allow_blank=True)
+    amenities = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+    )
+    photos = serializers.ListField(
+        child=serializers.URLField(max_length=200),
+        required=False,
+    )
+
+
+def read_ndjson(lines):
+    """read the rows of NDJSON (a JSON object per line)
+
+    Keyword arguments:
+    lines -- an iterable of the lines (str or bytes)
+    Return: a generator of (the line number, the row or the parse error)
+    """
+
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"Invalid JSON: {e}")
+            continue
+
+        if not isinstance(row, dict):
+            yield number, ValueError("A row should be a JSON object")
+            continue
+
+        yield number, row
+
+
+def read_csv(lines):
+    """read the rows of CSV with a header line
+    'amenities' and 'photos' are separated by '|' ex) Wifi|Kitchen
+
+    Keyword arguments:
+    lines -- an iterable of the lines (str or bytes)
+    Return: a generator of (the line number, the row)
+    """
+
+    lines = (
+        line.decode("utf-8") if isinstance(line, bytes) else line for line in lines
+    )
+
+    for number, row in enumerate(csv.DictReader(lines), start=2):
+        for field in ("amenities", "photos"):
+            value = row.get(field)
+            row[field] = [item for item in (value or "").split("|") if item]
+
+        # empty cells are the default values
+        yield number, {field: value for field, value in row.items() if value != ""}
+
+
+class RoomImporter:
+    """import rooms in chunks
+
+    the categories and amenities are resolved by name with maps loaded once,
+    every chunk is written with 'bulk_create' for the rooms, the amenities
+    (the many to many table) and the photos, in one transaction per chunk.
+    the signals are not sent by 'bulk_create', the profile of the owner is cleared at the end
+    (the rooms are new, no cached room detail depends on them)
+
+    ex) RoomImporter(owner=user).run(read_ndjson(file))
+    """
+
+    CHUNK_SIZE = 1000
+
+    def __init__(self, owner, chunk_size=CHUNK_SIZE):
+        self.owner = owner
+        self.chunk_size = chunk_size
+        self.categories = dict(
+            Category.objects.filter(
+                kind=Category.CategoryKindChoices.ROOMS,
+            ).values_list("name", "pk")
+        )
+        self.amenities = dict(Amenity.objects.values_list("name", "pk"))
+        self.created = 0
+        self.errors = []
+
+    def build(self, row):
+        """validate a row
+
+        Keyword arguments:
+        row -- the row as a dict
+        Return: (the unsaved Room, the amenity pks, the photo urls), or the errors
+        """
+
+        serializer = RoomImportSerializer(data=row)
+
+        if not serializer.is_valid():
+            return serializer.errors
+
+        data = dict(serializer.validated_data)
+        category = data.pop("category", None)
+        amenities = data.pop("amenities", [])
+        photos = data.pop("photos", [])
+        errors = {}
+
+        if category and category not in self.categories:
+            errors["category"] = [f"Category not found: {category}"]
+
+        missing_amenities = [name for name in amenities if name not in self.amenities]
+        if missing_amenities:
+            errors["amenities"] = [f"Amenity not found: {missing_amenities}"]
+
+        if errors:
+            return errors
+
+        room = Room(
+            owner=self.owner,
+            category_id=self.categories.get(category),
+            **data,
+        )
+        amenity_pks = {self.amenities[name] for name in amenities}
+
+        return room, amenity_pks, photos
+
+    def flush(self, chunk):
+        """write a chunk of built rows"""
+
+        if not chunk:
+            return
+
+        with transaction.atomic():
+            rooms = Room.objects.bulk_create([room for room, _, _ in chunk])
+
+            Room.amenities.through.objects.bulk_create(
+                [
+                    Room.amenities.through(room_id=room.pk, amenity_id=amenity_pk)
+                    for room, amenity_pks, _ in chunk
+                    for amenity_pk in amenity_pks
+                ]
+            )
+            Photo.objects.bulk_create(
+                [
+                    Photo(room_id=room.pk, file=url, description=room.name[:140])
+                    for room, _, photos in chunk
+                    for url in photos
+                ]
+            )
+
+        self.created += len(rooms)
+
+    def run(self, rows):
+        """import the rows
+
+        Keyword arguments:
+        rows -- an iterable of (the line number, the row), see 'read_ndjson' and 'read_csv'
+        Return: the report {"created": the number of rooms, "errors": [{"line", "errors"}]}
+        """
+
+        chunk = []
+
+        for number, row in rows:
+            if isinstance(row, Exception):
+                self.errors.append({"line": number, "errors": [str(row)]})
+                continue
+
+            built = self.build(row)
+
+            if isinstance(built, tuple):
+                chunk.append(built)
+            else:
+                self.errors.append({"line": number, "errors": built})
+
+            if len(chunk) >= self.chunk_size:
+                self.flush(chunk)
+                chunk = []
+
+        self.flush(chunk)
+
+        # 'bulk_create' doesn't send the signals clearing the profile
+        if self.created:
+            clear_public_profiles(self.owner.username)
+
+        return {
+            "created": self.created,
+            "errors": self.errors,
+        }
@@ -0,0 +1,55 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from users.models import User
+from rooms.imports import RoomImporter, read_csv, read_ndjson
+
+
+class Command(BaseCommand):
+    """import rooms from a NDJSON or CSV file
+    ex) python manage.py import_rooms rooms.ndjson --owner host
+    ex) python manage.py import_rooms rooms.csv --owner host --report errors.json
+    """
+
+    help = "Import rooms in bulk from a NDJSON or CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="the .ndjson/.jsonl or .csv file")
+        parser.add_argument("--owner", required=True, help="the username of the host")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=RoomImporter.CHUNK_SIZE,
+        )
+        parser.add_argument("--report", help="the file to write the errors to")
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(username=options["owner"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with {options['owner']}")
+
+        read = read_csv if options["path"].endswith(".csv") else read_ndjson
+        importer = RoomImporter(owner=owner, chunk_size=options["chunk_size"])
+        start = time.perf_counter()
+
+        with open(options["path"], encoding="utf-8", newline="") as file:
+            report = importer.run(read(file))
+
+        elapsed = time.perf_counter() - start
+
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as file:
+                json.dump(report["errors"], file, indent=2, default=str)
+
+        for error in report["errors"][:10]:
+            self.stderr.write(
+                f"line {error['line']}: {json.dumps(error['errors'], default=str)}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {report['created']} rooms in {elapsed:.1f}s, "
+                f"{len(report['errors'])} errors"
+            )
+        )
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from reviews.models import Review
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    """rebuild the denormalized review summary ('review_count', 'rating_sum', 'rating_histogram')
+    of every room
+    ex) python manage.py rebuild_room_ratings
+    """
+
+    help = (
+        "Rebuild the stored review count, rating sum and rating histogram of every room"
+    )
+
+    BATCH_SIZE = 1000
+
+    def handle(self, *args, **options):
+        reviews = Review.objects.filter(room=OuterRef("pk")).order_by().values("room")
+
+        # the number of the reviews per rating of every room, in one grouped query
+        histograms = {}
+        for aggregate in (
+            Review.objects.filter(room__isnull=False)
+            .order_by()
+            .values("room", "rating")
+            .annotate(count=Count("pk"))
+            .iterator()
+        ):
+            histograms.setdefault(aggregate["room"], {})[str(aggregate["rating"])] = (
+                aggregate["count"]
+            )
+
+        with transaction.atomic():
+            updated = Room.objects.update(
+                review_count=Coalesce(
+                    Subquery(
+                        reviews.annotate(count=Count("pk")).values("count"),
+                        output_field=IntegerField(),
+                    ),
+                    Value(0),
+                ),
+                rating_sum=Coalesce(
+                    Subquery(
+                        reviews.annotate(total=Sum("rating")).values("total"),
+                        output_field=IntegerField(),
+                    ),
+                    Value(0),
+                ),
+                rating_histogram={},
+            )
+
+            Room.objects.bulk_update(
+                [
+                    Room(pk=room_pk, rating_histogram=histogram)
+                    for room_pk, histogram in histograms.items()
+                ],
+                ["rating_histogram"],
+                batch_size=self.BATCH_SIZE,
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings of {updated} rooms"))
@@ -0,0 +1,42 @@
+# Generated by Django 4.1.13 on 2026-10-18 17:56
+
+from django.db import migrations, models
+
+
+def fill_review_aggregates(apps, schema_editor):
+    Room = apps.get_model("rooms", "Room")
+    Review = apps.get_model("reviews", "Review")
+
+    aggregates = (
+        Review.objects.filter(room__isnull=False)
+        .order_by()
+        .values("room")
+        .annotate(count=models.Count("pk"), total=models.Sum("rating"))
+    )
+
+    for aggregate in aggregates.iterator():
+        Room.objects.filter(pk=aggregate["room"]).update(
+            review_count=aggregate["count"],
+            rating_sum=aggregate["total"],
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("rooms", "0005_alter_room_amenities_alter_room_category_and_more"),
+        ("reviews", "0002_alter_review_experience_alter_review_room_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_review_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.1.13 on 2026-10-18 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0006_room_review_count_room_rating_sum"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["created_at", "id"], name="rooms_room_created_2438c1_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["owner", "created_at"], name="rooms_room_owner_i_c508bb_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.13 on 2026-10-18 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0007_room_rooms_room_created_2438c1_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["city", "price"], name="rooms_room_city_136688_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["country", "city", "kind"], name="rooms_room_country_59a748_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(fields=["price"], name="rooms_room_price_a62835_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.1.13 on 2026-10-18 18:11
+
+from django.db import migrations, models
+
+
+def fill_rating_histograms(apps, schema_editor):
+    Room = apps.get_model("rooms", "Room")
+    Review = apps.get_model("reviews", "Review")
+
+    histograms = {}
+    for aggregate in (
+        Review.objects.filter(room__isnull=False)
+        .order_by()
+        .values("room", "rating")
+        .annotate(count=models.Count("pk"))
+    ):
+        histograms.setdefault(aggregate["room"], {})[str(aggregate["rating"])] = (
+            aggregate["count"]
+        )
+
+    for room_pk, histogram in histograms.items():
+        Room.objects.filter(pk=room_pk).update(rating_histogram=histogram)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0008_room_search_indexes"),
+        ("reviews", "0003_review_reviews_rev_room_id_60a6db_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="rating_histogram",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.RunPython(fill_rating_histograms, migrations.RunPython.noop),
+    ]
@@ -55,6 +55,32 @@ class Room(CommonModel):
         related_name="rooms",
     )
 
+    # denormalized review aggregates, kept in sync by 'reviews.signals'
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    # the number of the reviews per rating ex) {"5": 10, "4": 2}
+    rating_histogram = models.JSONField(
+        default=dict,
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            # keyset pagination of the room list and the host rooms
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["owner", "created_at"]),
+            # room search
+            models.Index(fields=["city", "price"]),
+            models.Index(fields=["country", "city", "kind"]),
+            models.Index(fields=["price"]),
+        ]
+
     def __str__(room) -> str:
         return room.name
 
@@ -62,18 +88,13 @@ class Room(CommonModel):
         return room.amenities.count()
 
     def total_reviews(room):
-        return room.reviews.count()
+        return room.review_count
 
     def rating(room):
-        count = room.reviews.count()
-
-        if count == 0:
+        if room.review_count == 0:
             return 0
         else:
-            total_rating = 0
-            for review in room.reviews.all().values("rating"):
-                total_rating += review["rating"]
-            return round(total_rating / count, 2)
+            return round(room.rating_sum / room.review_count, 2)
 
 
 class Amenity(CommonModel):
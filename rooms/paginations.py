@@ -1,5 +1,16 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 
 
-class HostRoomPagination(PageNumberPagination):
+class RoomPagination(CursorPagination):
     page_size = 10
+    ordering = ("-created_at", "-pk")
+
+
+class HostRoomPagination(CursorPagination):
+    page_size = 10
+    ordering = ("-created_at", "-pk")
+
+
+class AmenityPagination(CursorPagination):
+    page_size = 3
+    ordering = ("created_at", "pk")
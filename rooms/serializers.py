@@ -5,7 +5,7 @@ from users.serializers import UserSerializerForRoomDetail
 from reviews.serializers import ReviewSerializer
 from categories.serializers import CategorySerializer
 from medias.serializers import PhotoSerializer
-from wishlists.models import Wishlist
+from wishlists.likes import get_liked_room_pks
 
 
 class AmenitiySerializer(ModelSerializer):
@@ -22,6 +22,9 @@ class AmenitiySerializer(ModelSerializer):
 class RoomDetailSerializer(ModelSerializer):
     """Serailizer Definition for Room Detail"""
 
+    # the number of the latest reviews embedded in the room detail
+    LATEST_REVIEWS = 3
+
     # models that have a relation with a room
     owner = UserSerializerForRoomDetail(read_only=True)
     # amenities = AmenitiySerializer(read_only=True, many=True)
@@ -35,9 +38,14 @@ class RoomDetailSerializer(ModelSerializer):
 
     photos = PhotoSerializer(many=True, read_only=True)
 
+    latest_reviews = serializers.SerializerMethodField()
+
     class Meta:
         model = Room
         fields = "__all__"
+        # the amenities are validated and set by the views with one query,
+        # not one query per amenity by the serializer
+        read_only_fields = ("amenities",)
 
     # the method calculating the average of the rating
     def get_avg_rating(self, room):
@@ -45,23 +53,57 @@ class RoomDetailSerializer(ModelSerializer):
 
     def get_is_owner(self, room):
         request = self.context["request"]
-        return room.owner == request.user
+        return room.owner_id == request.user.pk
 
     def get_is_liked(self, room):
         request = self.context["request"]
-        return Wishlist.objects.filter(user=request.user, rooms__pk=room.pk).exists()
+        return room.pk in get_liked_room_pks(request)
+
+    # one query using the (room, created_at) index, with the users joined
+    def get_latest_reviews(self, room):
+        reviews = room.reviews.select_related("user").order_by("-created_at", "-pk")
+        return ReviewSerializer(reviews[: self.LATEST_REVIEWS], many=True).data
 
     # def create(self, validated_data):
     #     print(validated_data)
     #     return
 
 
+class AsyncRoomDetailSerializer(RoomDetailSerializer):
+    """Serializer Definition for Room Detail of the async views
+
+    the related rows are loaded by the view and given in the context
+    ('user', 'is_liked', 'photos', 'amenity_pks', 'latest_reviews'),
+    so serializing doesn't touch the database
+    """
+
+    photos = serializers.SerializerMethodField()
+    amenities = serializers.SerializerMethodField()
+
+    def get_is_owner(self, room):
+        user = self.context["user"]
+        return user is not None and room.owner_id == user.pk
+
+    def get_is_liked(self, room):
+        return self.context["is_liked"]
+
+    def get_photos(self, room):
+        return PhotoSerializer(self.context["photos"], many=True).data
+
+    def get_amenities(self, room):
+        return self.context["amenity_pks"]
+
+    def get_latest_reviews(self, room):
+        return ReviewSerializer(self.context["latest_reviews"], many=True).data
+
+
 class RoomListSerializer(ModelSerializer):
     """Serailizer Definition for Room List"""
 
     # avg ratings
     avg_rating = serializers.SerializerMethodField()
     is_owner = serializers.SerializerMethodField()
+    is_liked = serializers.SerializerMethodField()
 
     photos = PhotoSerializer(many=True, read_only=True)
 
@@ -75,6 +117,7 @@ class RoomListSerializer(ModelSerializer):
             "price",
             "avg_rating",
             "is_owner",
+            "is_liked",
             "photos",
         )
 
@@ -82,9 +125,15 @@ class RoomListSerializer(ModelSerializer):
     def get_avg_rating(self, room):
         return room.rating()
 
+    # compare the ids so the owner is not fetched for every room
     def get_is_owner(self, room):
         request = self.context["request"]
-        return room.owner == request.user
+        return room.owner_id == request.user.pk
+
+    # one query for all the rooms, see 'wishlists.likes'
+    def get_is_liked(self, room):
+        request = self.context["request"]
+        return room.pk in get_liked_room_pks(request)
 
 
 class HostRoomSerializer(ModelSerializer):
@@ -111,11 +160,31 @@ class HostRoomSerializer(ModelSerializer):
             "rating",
         )
 
+    # annotated on the queryset by 'users.views.HostRooms'
     def get_total_amenities(self, room):
-        return room.total_amenities()
+        return room.amenity_count
 
     def get_total_reviews(self, room):
         return room.total_reviews()
 
     def get_rating(self, room):
         return room.rating()
+
+
+class AsyncRoomListSerializer(RoomListSerializer):
+    """Serializer Definition for Room List of the async views
+
+    the context has 'user', 'liked_room_pks' and 'photos' (the photos by room pk)
+    """
+
+    photos = serializers.SerializerMethodField()
+
+    def get_is_owner(self, room):
+        user = self.context["user"]
+        return user is not None and room.owner_id == user.pk
+
+    def get_is_liked(self, room):
+        return room.pk in self.context["liked_room_pks"]
+
+    def get_photos(self, room):
+        return PhotoSerializer(self.context["photos"].get(room.pk, []), many=True).data
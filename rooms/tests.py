@@ -1,3 +1,510 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import Client
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from bookings.models import Booking
+from users.models import User
+from medias.models import Photo
+from reviews.models import Review
+from categories.models import Category
+from common.testing import QueryCountGuard, create_room
+from reviews.paginations import RoomReviewPagination
+from wishlists.models import Wishlist
+from .models import Amenity, Room
+from .paginations import AmenityPagination, RoomPagination
 
-# Create your tests here.
+
+class TestRooms(APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.owner = User.objects.create(username="owner")
+
+    def create_rooms(self, count):
+        for i in range(count):
+            room = create_room(self.owner, name=f"Room {i}")
+            Photo.objects.create(
+                file="https://example.com/photo.jpg",
+                description="photo",
+                room=room,
+            )
+            Review.objects.create(
+                user=self.owner,
+                room=room,
+                payload="good",
+                rating=4,
+            )
+
+    def test_list_rooms(self):
+        self.create_rooms(2)
+
+        response = self.client.get(self.URL)
+        data = response.json()["results"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[0]["avg_rating"], 4)
+        self.assertEqual(len(data[0]["photos"]), 1)
+        self.assertFalse(data[0]["is_owner"])
+
+    def test_list_rooms_query_count(self):
+        # rooms + photos, whatever the number of rooms
+        # (the validators are the versions in the cache)
+        for count in (1, 10):
+            Room.objects.all().delete()
+            self.create_rooms(count)
+
+            with self.assertNumQueries(2):
+                self.client.get(self.URL)
+
+    def test_list_rooms_etag(self):
+        self.create_rooms(2)
+        etag = self.client.get(self.URL)["ETag"]
+
+        self.assertEqual(
+            self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        for change in (
+            lambda: Photo.objects.create(
+                file="https://example.com/new.jpg", room=Room.objects.first()
+            ),
+            lambda: Review.objects.create(
+                user=self.owner, room=Room.objects.first(), payload="bad", rating=1
+            ),
+            lambda: Room.objects.first().delete(),
+        ):
+            change()
+            response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            etag = response["ETag"]
+
+    def test_list_rooms_is_owner(self):
+        self.create_rooms(1)
+        self.client.force_authenticate(self.owner)
+
+        response = self.client.get(self.URL)
+
+        self.assertTrue(response.json()["results"][0]["is_owner"])
+
+    def test_list_rooms_cursor(self):
+        self.create_rooms(15)
+
+        first_page = self.client.get(self.URL).json()
+        second_page = self.client.get(first_page["next"]).json()
+
+        self.assertEqual(len(first_page["results"]), 10)
+        self.assertEqual(len(second_page["results"]), 5)
+        self.assertIsNone(second_page["next"])
+        self.assertEqual(first_page["results"][0]["name"], "Room 14")
+        self.assertEqual(second_page["results"][-1]["name"], "Room 0")
+
+    def test_search_rooms(self):
+        self.create_rooms(3)
+        wifi = Amenity.objects.create(name="Wifi")
+        kitchen = Amenity.objects.create(name="Kitchen")
+        cheap, expensive, busan = Room.objects.order_by("pk")
+        cheap.amenities.add(wifi, kitchen)
+        expensive.amenities.add(wifi)
+        expensive.price = 500
+        expensive.save()
+        busan.city = "Busan"
+        busan.save()
+
+        def search(query):
+            response = self.client.get(self.URL + query)
+            return [room["pk"] for room in response.json()["results"]]
+
+        self.assertEqual(search("?city=Busan"), [busan.pk])
+        self.assertEqual(search("?city=Seoul&max_price=200"), [cheap.pk])
+        self.assertEqual(
+            sorted(search(f"?amenities={wifi.pk}")), [cheap.pk, expensive.pk]
+        )
+        self.assertEqual(search(f"?amenities={wifi.pk},{kitchen.pk}"), [cheap.pk])
+
+    def test_search_rooms_invalid_query(self):
+        for query in ("?min_price=abc", "?kind=castle", "?amenities=a,b"):
+            response = self.client.get(self.URL + query)
+            self.assertEqual(response.status_code, 400)
+
+    def test_search_available_rooms(self):
+        self.create_rooms(2)
+        booked, free = Room.objects.order_by("pk")
+        today = timezone.localtime(timezone.now()).date()
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.owner,
+            room=booked,
+            check_in=today + timedelta(days=3),
+            check_out=today + timedelta(days=5),
+            guests=1,
+        )
+
+        def search(check_in, check_out):
+            response = self.client.get(
+                self.URL,
+                {
+                    "check_in": today + timedelta(days=check_in),
+                    "check_out": today + timedelta(days=check_out),
+                },
+            )
+            return sorted(room["pk"] for room in response.json()["results"])
+
+        self.assertEqual(search(1, 3), [booked.pk, free.pk])
+        self.assertEqual(search(4, 6), [free.pk])
+        self.assertEqual(search(5, 7), [booked.pk, free.pk])
+
+
+class TestRoomAmenities(APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.owner = User.objects.create(username="owner")
+        self.category = Category.objects.create(
+            name="Hanok",
+            kind=Category.CategoryKindChoices.ROOMS,
+        )
+        self.amenities = [Amenity.objects.create(name=f"Amenity {i}") for i in range(5)]
+        self.client.force_authenticate(self.owner)
+
+    def create_room(self, amenities):
+        return self.client.post(
+            self.URL,
+            {
+                "name": "Room",
+                "price": 100,
+                "rooms": 1,
+                "toilets": 1,
+                "description": "description",
+                "address": "address",
+                "kind": Room.RoomKindChoices.ENTIRE_PLACE,
+                "category": self.category.pk,
+                "amenities": amenities,
+            },
+            format="json",
+        )
+
+    def test_create_room_with_amenities(self):
+        response = self.create_room([amenity.pk for amenity in self.amenities])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["amenities"]), 5)
+
+    def test_create_room_with_missing_amenities(self):
+        response = self.create_room([self.amenities[0].pk, 9998, 9999])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("[9998, 9999]", response.json()["detail"])
+        self.assertFalse(Room.objects.exists())
+
+    def test_update_room_amenities(self):
+        room_pk = self.create_room([self.amenities[0].pk]).json()["id"]
+
+        response = self.client.put(
+            f"{self.URL}{room_pk}",
+            {"amenities": [self.amenities[1].pk, self.amenities[2].pk]},
+            format="json",
+        )
+
+        self.assertEqual(
+            sorted(response.json()["amenities"]),
+            [self.amenities[1].pk, self.amenities[2].pk],
+        )
+
+
+class TestRoomImport(APITestCase):
+    URL = "/api/v1/rooms/import"
+
+    def setUp(self):
+        self.owner = User.objects.create(username="owner")
+        Category.objects.create(name="Hanok", kind=Category.CategoryKindChoices.ROOMS)
+        Amenity.objects.create(name="Wifi")
+        self.client.force_authenticate(self.owner)
+
+    def test_import_ndjson(self):
+        rows = [
+            {
+                "name": f"Room {i}",
+                "price": 100,
+                "rooms": 1,
+                "toilets": 1,
+                "description": "description",
+                "address": "address",
+                "kind": "private_room",
+                "category": "Hanok",
+                "amenities": ["Wifi"],
+                "photos": ["https://example.com/photo.jpg"],
+            }
+            for i in range(3)
+        ]
+        rows.append({**rows[0], "amenities": ["Pool"]})
+
+        response = self.client.generic(
+            "POST",
+            self.URL,
+            "\n".join(json.dumps(row) for row in rows),
+            content_type="application/x-ndjson",
+        )
+
+        self.assertEqual(response.json()["created"], 3)
+        self.assertEqual(response.json()["errors"][0]["line"], 4)
+        self.assertEqual(Room.objects.filter(owner=self.owner).count(), 3)
+        self.assertEqual(Room.amenities.through.objects.count(), 3)
+        self.assertEqual(Photo.objects.count(), 3)
+
+    def test_import_csv(self):
+        body = (
+            "name,price,rooms,toilets,description,address,kind,amenities\n"
+            "Room,100,1,1,description,address,shared_room,Wifi\n"
+            "Castle,100,1,1,description,address,castle,\n"
+        )
+
+        response = self.client.generic("POST", self.URL, body, content_type="text/csv")
+
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual(response.json()["errors"][0]["line"], 3)
+
+
+class TestRoomDetail(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username="owner")
+        self.room = create_room(
+            self.owner,
+            category=Category.objects.create(
+                name="Hanok",
+                kind=Category.CategoryKindChoices.ROOMS,
+            ),
+        )
+        self.url = f"/api/v1/rooms/{self.room.pk}"
+
+        for i in range(3):
+            self.room.amenities.add(Amenity.objects.create(name=f"Amenity {i}"))
+            Photo.objects.create(
+                file="https://example.com/photo.jpg",
+                description="photo",
+                room=self.room,
+            )
+            Review.objects.create(
+                user=self.owner, room=self.room, payload="good", rating=i + 3
+            )
+
+    def test_room_detail(self):
+        self.client.force_authenticate(self.owner)
+
+        data = self.client.get(self.url).json()
+
+        self.assertEqual(data["owner"]["username"], "owner")
+        self.assertEqual(data["category"]["name"], "Hanok")
+        self.assertEqual(len(data["photos"]), 3)
+        self.assertEqual(len(data["amenities"]), 3)
+        self.assertEqual(data["avg_rating"], 4)
+        self.assertTrue(data["is_owner"])
+        self.assertFalse(data["is_liked"])
+
+    def test_room_detail_reviews(self):
+        data = self.client.get(self.url).json()
+
+        self.assertEqual(data["rating_histogram"], {"3": 1, "4": 1, "5": 1})
+        self.assertEqual(
+            [review["rating"] for review in data["latest_reviews"]], [5, 4, 3]
+        )
+        self.assertEqual(data["latest_reviews"][0]["user"]["username"], "owner")
+
+        review = Review.objects.filter(rating=3).get()
+        review.rating = 5
+        review.save()
+        Review.objects.filter(rating=4).get().delete()
+
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.rating_histogram, {"5": 2})
+        self.assertEqual(self.room.total_reviews(), 2)
+
+    def test_room_detail_etag_follows_owner(self):
+        response = self.client.get(self.url)
+
+        self.owner.name = "New Name"
+        self.owner.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["owner"]["name"], "New Name")
+
+    def test_room_detail_etag_follows_reviewer(self):
+        guest = User.objects.create(username="guest")
+        Review.objects.create(user=guest, room=self.room, payload="nice", rating=5)
+        response = self.client.get(self.url)
+
+        guest.name = "Guest Name"
+        guest.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["latest_reviews"][0]["user"]["name"], "Guest Name"
+        )
+
+    def test_room_detail_cached_per_room(self):
+        guest = User.objects.create(username="guest")
+        other_room = create_room(guest, name="Other Room")
+        self.client.force_authenticate(guest)
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+
+        # the login of the owner only saves 'last_login'
+        Client().force_login(self.owner)
+        other_room.name = "Renamed"
+        other_room.save()
+        # the likes of the other users
+        Wishlist.objects.create(name="Trip", user=self.owner).rooms.add(self.room)
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+
+        self.room.name = "Renamed"
+        self.room.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["name"], "Renamed")
+
+    def test_room_detail_query_count(self):
+        # validators, room + owner + category, photos, amenities, latest reviews + users
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+
+        # + the liked rooms of the user
+        self.client.force_authenticate(self.owner)
+        cache.clear()
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+
+
+class TestAsyncRooms(APITestCase):
+    URL = "/api/v1/async/rooms/"
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username="owner")
+
+        for i in range(12):
+            room = create_room(self.owner, name=f"Room {i}", price=100 + i)
+            Photo.objects.create(
+                file="https://example.com/photo.jpg",
+                description="photo",
+                room=room,
+            )
+
+        self.room = room
+        for i in range(4):
+            self.room.amenities.add(Amenity.objects.create(name=f"Amenity {i}"))
+            Review.objects.create(
+                user=self.owner, room=self.room, payload="good", rating=i + 2
+            )
+
+    def test_async_room_detail(self):
+        self.client.force_login(self.owner)
+
+        data = self.client.get(f"{self.URL}{self.room.pk}").json()
+        cache.clear()
+
+        self.assertEqual(data, self.client.get(f"/api/v1/rooms/{self.room.pk}").json())
+        self.assertTrue(data["is_owner"])
+        self.assertEqual(len(data["latest_reviews"]), 3)
+
+    def test_async_room_detail_not_found(self):
+        response = self.client.get(f"{self.URL}0")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_async_rooms(self):
+        response = self.client.get(self.URL, {"min_price": 101})
+        data = response.json()
+
+        self.assertEqual(len(data["results"]), 10)
+        self.assertEqual(data["results"][0]["photos"][0]["description"], "photo")
+
+        data = self.client.get(data["next"]).json()
+
+        self.assertEqual(
+            [room["name"] for room in data["results"]],
+            ["Room 1"],
+        )
+        self.assertIsNone(data["next"])
+
+    def test_async_rooms_invalid_query(self):
+        response = self.client.get(self.URL, {"min_price": "cheap"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_async_room_reviews_and_amenities(self):
+        reviews = self.client.get(f"{self.URL}{self.room.pk}/reviews").json()
+        amenities = self.client.get(f"{self.URL}{self.room.pk}/amenities").json()
+
+        self.assertEqual(
+            reviews["results"],
+            self.client.get(f"/api/v1/rooms/{self.room.pk}/reviews").json()["results"],
+        )
+        self.assertEqual(
+            [amenity["name"] for amenity in amenities["results"]],
+            ["Amenity 0", "Amenity 1", "Amenity 2"],
+        )
+        self.assertIsNotNone(amenities["next"])
+
+    def test_async_room_calendar(self):
+        self.assertEqual(
+            self.client.get(f"{self.URL}{self.room.pk}/calendar?months=3").json(),
+            self.client.get(f"/api/v1/rooms/{self.room.pk}/calendar?months=3").json(),
+        )
+
+
+class TestRoomQueries(QueryCountGuard, APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create(username="owner")
+        self.user = User.objects.create(username="user")
+        self.wishlist = Wishlist.objects.create(name="Trip", user=self.user)
+        self.room = self.create_room(0)
+        self.client.force_authenticate(self.user)
+
+    def create_room(self, index):
+        room = create_room(self.owner, name=f"Room {index}")
+        Photo.objects.create(
+            file="https://example.com/photo.jpg",
+            description="photo",
+            room=room,
+        )
+        Review.objects.create(user=self.user, room=room, payload="good", rating=4)
+        self.wishlist.rooms.add(room)
+        return room
+
+    def test_rooms(self):
+        self.assertQueriesDontGrow("/api/v1/rooms/", self.create_room, RoomPagination)
+
+    def test_room_reviews(self):
+        def create_review(index):
+            Review.objects.create(
+                user=User.objects.create(username=f"reviewer{index}"),
+                room=self.room,
+                payload="good",
+                rating=5,
+            )
+
+        self.assertQueriesDontGrow(
+            f"/api/v1/rooms/{self.room.pk}/reviews",
+            create_review,
+            RoomReviewPagination,
+        )
+
+    def test_room_amenities(self):
+        def create_amenity(index):
+            self.room.amenities.add(Amenity.objects.create(name=f"Amenity {index}"))
+
+        self.assertQueriesDontGrow(
+            f"/api/v1/rooms/{self.room.pk}/amenities",
+            create_amenity,
+            AmenityPagination,
+        )
+
+    def test_amenities(self):
+        def create_amenity(index):
+            Amenity.objects.create(name=f"Amenity {index}")
+
+        self.assertQueriesDontGrow("/api/v1/rooms/amenities/", create_amenity)
@@ -1,5 +1,5 @@
 from django.db import transaction
-from django.conf import settings
+from django.db.models import Count, Exists, Max, OuterRef, Prefetch
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -9,22 +9,64 @@ from rest_framework.exceptions import (
     PermissionDenied,
 )
 from rest_framework.status import HTTP_204_NO_CONTENT
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from .models import Amenity, Room
 from .serializers import AmenitiySerializer, RoomListSerializer, RoomDetailSerializer
+from .paginations import RoomPagination, AmenityPagination
+from .filters import filter_rooms
+from .imports import RoomImporter, read_csv, read_ndjson
+from common.cache import cache_response, get_versions
+from common.conditional import (
+    collection_validators,
+    conditional_get,
+    namespace_validators,
+)
+from reviews.paginations import RoomReviewPagination
 from reviews.serializers import ReviewSerializer
 from medias.serializers import PhotoSerializer
 from categories.models import Category
+from wishlists.models import Wishlist
 from bookings.models import Booking
+from bookings.calendars import MAX_MONTHS, get_room_calendar
 from bookings.serializers import PublicBookingSerializer, CreateRoomBookingSerializer
 
 
+def get_amenities(amenity_pks):
+    """get the amenities with the 'pk's given by user, with one query
+
+    Keyword arguments:
+    amenity_pks -- the list of the amenity pks
+    Return: the list of the amenities, or ParseError with the pks not found
+    """
+
+    if not isinstance(amenity_pks, list):
+        raise ParseError("'amenities' should be a list of ids")
+
+    try:
+        amenity_pks = {int(pk) for pk in amenity_pks}
+    except (TypeError, ValueError):
+        raise ParseError("'amenities' should be a list of ids")
+
+    amenities = list(Amenity.objects.filter(pk__in=amenity_pks))
+    missing_pks = amenity_pks - {amenity.pk for amenity in amenities}
+
+    if missing_pks:
+        raise ParseError(f"Amenity not found: {sorted(missing_pks)}")
+
+    return amenities
+
+
 class Amenities(APIView):
     """
     Amenities API URL for "GET" and "POST" request
     example : /api/v1/rooms/amenities
     """
 
+    def get_validators(self, request):
+        return collection_validators(Amenity.objects.all())
+
+    @conditional_get(get_validators)
+    @cache_response("amenities")
     def get(self, request):
         all_amenities = Amenity.objects.all()
         serializer = AmenitiySerializer(all_amenities, many=True)
@@ -95,16 +137,37 @@ class Rooms(APIView):
     """
     Rooms API URL for "GET" and "POST" request
     example : /api/v1/rooms
+    search example : /api/v1/rooms/?city=Seoul&kind=private_room&max_price=100&amenities=1,2
     """
 
+    def get_validators(self, request):
+        # the versions bumped by the changes of the rooms, their photos, reviews and bookings
+        # (see 'common.signals'), instead of aggregating every room matching the search
+        # the likes of the user are for 'is_liked'
+        return namespace_validators(
+            "rooms",
+            "room-list",
+            "wishlists",
+            f"likes:{request.user.pk or 'anonymous'}",
+        )
+
+    @conditional_get(get_validators)
     def get(self, request):
-        all_rooms = Room.objects.all()
+        all_rooms = filter_rooms(
+            Room.objects.prefetch_related("photos"),
+            request.query_params,
+        )
+
+        # keyset pagination on (created_at, pk) with opaque cursor tokens
+        paginator = RoomPagination()
+        page = paginator.paginate_queryset(all_rooms, request, view=self)
+
         serializer = RoomListSerializer(
-            all_rooms,
+            page,
             many=True,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = RoomDetailSerializer(data=request.data)
@@ -128,25 +191,25 @@ class Rooms(APIView):
             except Category.DoesNotExist:
                 raise ParseError("Category not found")
 
-            # apply django db transaction for amenities
-            try:
-                with transaction.atomic():
-                    room = serializer.save(
-                        owner=request.user,
-                        category=category,
-                    )
+            # get amenities with the 'pk's from user request, before writing anything
+            amenities = get_amenities(request.data.get("amenities", []))
 
-                    # get amenity 'pk's from user request
-                    amenities = request.data.get("amenities")
+            # apply django db transaction for amenities
+            with transaction.atomic():
+                room = serializer.save(
+                    owner=request.user,
+                    category=category,
+                )
 
-                    # add a amenity to room
-                    for amenity_pk in amenities:
-                        amenity = Amenity.objects.get(pk=amenity_pk)
-                        room.amenities.add(amenity)
+                # add the amenities to room with one bulk insert
+                room.amenities.set(amenities)
 
-                    return Response(RoomDetailSerializer(room).data)
-            except Exception:
-                raise ParseError("Amenity not found")
+            return Response(
+                RoomDetailSerializer(
+                    room,
+                    context={"request": request},
+                ).data
+            )
 
         else:
             return Response(serializer.errors)
@@ -167,8 +230,63 @@ class RoomDetail(APIView):
         except Room.DoesNotExist:
             raise NotFound
 
+    def get_validators(self, request, pk):
+        # everything the detail depends on, in one query
+        # (the 'updated_at' of the room, its category and photos, 'is_liked' of the user,
+        # and the owner shown in the detail, who has no 'updated_at')
+        row = (
+            Room.objects.filter(pk=pk)
+            .annotate(
+                photos_count=Count("photos"),
+                photos_updated_at=Max("photos__updated_at"),
+                is_liked=Exists(
+                    Wishlist.objects.filter(
+                        user=request.user.pk,
+                        rooms=OuterRef("pk"),
+                    )
+                ),
+            )
+            .values_list(
+                "updated_at",
+                "category__updated_at",
+                "photos_updated_at",
+                "photos_count",
+                "is_liked",
+                "owner__username",
+                "owner__name",
+                "owner__avatar",
+            )
+            .first()
+        )
+
+        if row is None:
+            return None
+
+        # with the cached version of the detail, bumped by what the row doesn't show
+        # (ex) a reviewer of the latest reviews renamed, see 'common.signals')
+        # not the latest 'updated_at' as the last modified, the other parts have none
+        return (*row, *get_versions([f"rooms:{pk}"])), None
+
+    def get_detail(self, pk):
+        """the room with everything the detail serializer reads, in a fixed number of queries
+        (the room with its owner and category, its photos, its amenity pks)"""
+
+        try:
+            return (
+                Room.objects.select_related("owner", "category")
+                .prefetch_related(
+                    "photos",
+                    Prefetch("amenities", queryset=Amenity.objects.only("pk")),
+                )
+                .get(pk=pk)
+            )
+        except Room.DoesNotExist:
+            raise NotFound
+
+    @conditional_get(get_validators)
+    @cache_response("rooms", "rooms:{pk}", "likes:{user}", per_user=True)
     def get(self, request, pk):
-        room = self.get_object(pk)
+        room = self.get_detail(pk)
         serializer = RoomDetailSerializer(
             room,
             context={"request": request},
@@ -208,36 +326,35 @@ class RoomDetail(APIView):
                 except Category.DoesNotExist:
                     raise ParseError("Category not found")
 
-            try:
-                with transaction.atomic():
-                    # if the category is given, create a updated room wtih the category
-                    if category_pk:
-                        updated_room = serializer.save(
-                            category=category,
-                        )
-                    # if the category is not given, create a updated room without the category
-                    else:
-                        updated_room = serializer.save()
-
-                    # get amenity 'pk's from user request
-                    amenities = request.data.get("amenities")
-
-                    # the case which user wants to update
-                    if amenities:
-                        # clear the existing amenities on the room
-                        updated_room.amenities.clear()
-
-                        # add new amenities to the room
-                        # if any amenity is not on DB, the ParseError is raised
-                        for amenity_pk in amenities:
-                            amenity = Amenity.objects.get(pk=amenity_pk)
-                            updated_room.amenities.add(amenity)
-
-                    return Response(RoomDetailSerializer(updated_room).data)
-
-            except Exception as e:
-                # the case Amenity with given pks is not found
-                raise ParseError("Amenity not found")
+            # get amenity 'pk's from user request
+            amenities = request.data.get("amenities")
+
+            # the case which user wants to update
+            # if any amenity is not on DB, the ParseError is raised with the pks
+            if amenities:
+                amenities = get_amenities(amenities)
+
+            with transaction.atomic():
+                # if the category is given, create a updated room wtih the category
+                if category_pk:
+                    updated_room = serializer.save(
+                        category=category,
+                    )
+                # if the category is not given, create a updated room without the category
+                else:
+                    updated_room = serializer.save()
+
+                # replace the amenities on the room,
+                # only the added/removed ones are inserted/deleted
+                if amenities:
+                    updated_room.amenities.set(amenities)
+
+            return Response(
+                RoomDetailSerializer(
+                    updated_room,
+                    context={"request": request},
+                ).data
+            )
 
         else:
             return Response(serializer.errors)
@@ -260,24 +377,22 @@ class RoomReviews(APIView):
         try:
             return Room.objects.get(pk=pk)
         except Room.DoesNotExist:
-            return NotFound
+            raise NotFound
 
     def get(self, request, pk):
-        try:
-            page = int(request.query_params.get("page", 1))
-        except ValueError:  # the case like ?page='adasda'
-            page = 1  # at this case set 'page' as '1' instead of sending error message
-
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
         room = self.get_object(pk)
+
+        paginator = RoomReviewPagination()
+        page = paginator.paginate_queryset(
+            room.reviews.select_related("user"), request, view=self
+        )
+
         serializer = ReviewSerializer(
-            room.reviews.all()[start:end],
+            page,
             many=True,
         )
 
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request, pk):
         serializer = ReviewSerializer(data=request.data)
@@ -296,24 +411,20 @@ class RoomAmenities(APIView):
         try:
             return Room.objects.get(pk=pk)
         except Room.DoesNotExist:
-            return NotFound
+            raise NotFound
 
     def get(self, request, pk):
-        try:
-            page = int(request.query_params.get("page", 1))
-        except ValueError:  # the case lie ?page='adasda'
-            page = 1  # at this case set 'page' as '1' instead of sending error message
-
-        page_size = 3
-        start = (page - 1) * page_size
-        end = start + page_size
         room = self.get_object(pk)
+
+        paginator = AmenityPagination()
+        page = paginator.paginate_queryset(room.amenities.all(), request, view=self)
+
         serializer = AmenitiySerializer(
-            room.amenities.all()[start:end],
+            page,
             many=True,
         )
 
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class RoomPhotos(APIView):
@@ -363,8 +474,8 @@ class RoomBookings(APIView):
 
         try:
             return Room.objects.get(pk=pk)
-        except:
-            return NotFound
+        except Room.DoesNotExist:
+            raise NotFound
 
     def get(self, request, pk):
         """GET request handler
@@ -400,7 +511,10 @@ class RoomBookings(APIView):
         """
 
         room = self.get_object(pk)
-        serializer = CreateRoomBookingSerializer(data=request.data)
+        serializer = CreateRoomBookingSerializer(
+            data=request.data,
+            context={"room": room},
+        )
 
         if serializer.is_valid():
             booking = serializer.save(
@@ -413,3 +527,64 @@ class RoomBookings(APIView):
 
         else:
             return Response(serializer.errors)
+
+
+class RoomCalendar(APIView):
+
+    """APIView for the availability calendar of a room"""
+
+    def get_object(self, pk):
+        try:
+            return Room.objects.get(pk=pk)
+        except Room.DoesNotExist:
+            raise NotFound
+
+    def get(self, request, pk):
+        """GET request handler
+        ex) GET /rooms/1/calendar?months=12
+
+        Keyword arguments:
+        request -- get request from user
+        pk -- the pk of the room
+        Return: the booked nights of the room from the current month,
+                a base64 bitset per month where bit 'n' is set when day 'n + 1' is booked
+        """
+
+        try:
+            months = int(request.query_params.get("months", 12))
+        except ValueError:
+            raise ParseError("'months' should be a number")
+
+        if not 1 <= months <= MAX_MONTHS:
+            raise ParseError(f"'months' should be between 1 and {MAX_MONTHS}")
+
+        room = self.get_object(pk)
+
+        return Response(get_room_calendar(room.pk, months))
+
+
+class RoomImport(APIView):
+
+    """APIView for importing many rooms of the user at once"""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """POST request handler
+        ex) POST /rooms/import with 'Content-Type: application/x-ndjson' (a room per line)
+        ex) POST /rooms/import with 'Content-Type: text/csv' (a header line, then a room per line)
+
+        Keyword arguments:
+        request -- the request from user, the body is read line by line
+        Return: the number of the created rooms and the errors per line
+        """
+
+        if request.stream is None:
+            raise ParseError("The rooms to import are required")
+
+        if request.content_type.startswith("text/csv"):
+            rows = read_csv(request.stream)
+        else:
+            rows = read_ndjson(request.stream)
+
+        return Response(RoomImporter(owner=request.user).run(rows))
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User
+from .models import User, Token
 
 
 @admin.register(User)
@@ -54,3 +54,17 @@ class CustomUserAdmin(UserAdmin):
         "name",
         "is_host",
     )
+
+
+@admin.register(Token)
+class TokenAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "user",
+        "created_at",
+    )
+
+    readonly_fields = (
+        "created_at",
+        "updated_at",
+    )
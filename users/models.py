@@ -1,5 +1,8 @@
+import hashlib
+import secrets
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from common.models import CommonModel
 
 
 class User(AbstractUser):
@@ -74,8 +77,40 @@ class User(AbstractUser):
         choices=CurrencyChoices.choices,
     )
 
-    def total_reviews(self):
-        return self.reviews.count()
 
-    def total_rooms(self):
-        return self.rooms.count()
+class Token(CommonModel):
+
+    """API Token Model Definition
+    only the SHA-256 digest of a token is stored, the token itself is shown once"""
+
+    user = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        related_name="tokens",
+    )
+
+    digest = models.CharField(
+        max_length=64,
+        unique=True,
+        editable=False,
+    )
+
+    def __str__(self) -> str:
+        return f"Token of {self.user}"
+
+    @staticmethod
+    def hash(key):
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user):
+        """create a token for the user
+
+        Keyword arguments:
+        user -- the owner of the token
+        Return: (the Token object, the token to give to the user)
+        """
+
+        key = secrets.token_urlsafe(32)
+        token = cls.objects.create(user=user, digest=cls.hash(key))
+        return token, key
@@ -0,0 +1,107 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, FloatField, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+from experiences.models import Experience
+from reviews.models import Review
+from rooms.models import Room
+from .models import User
+from .serializers import PublicUserSerializer
+
+CACHE_TIMEOUT = 60 * 60
+
+
+def public_profile_cache_key(username):
+    return f"users:public-profile:{username}"
+
+
+def count_rows(model, field):
+    """a subquery counting the rows of the model pointing to the user with 'field'"""
+
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def host_rating():
+    """a subquery of the average rating of the reviews of the rooms of the user,
+    from the stored review aggregates of the rooms (None without a review)"""
+
+    return Subquery(
+        Room.objects.filter(owner=OuterRef("pk"))
+        .order_by()
+        .values("owner")
+        .annotate(
+            rating=Cast(Sum("rating_sum"), FloatField())
+            / NullIf(Sum("review_count"), 0)
+        )
+        .values("rating"),
+        output_field=FloatField(),
+    )
+
+
+def get_profile_user(username):
+    """the user with the stats of the public profile, with one query
+
+    Keyword arguments:
+    username -- the username of the user
+    Return: the user annotated with 'review_total', 'room_total', 'experience_total'
+            and 'host_rating', or None if no user has the username
+    """
+
+    return (
+        User.objects.filter(username=username)
+        .annotate(
+            review_total=count_rows(Review, "user"),
+            room_total=count_rows(Room, "owner"),
+            experience_total=count_rows(Experience, "host"),
+            host_rating=host_rating(),
+        )
+        .first()
+    )
+
+
+def get_public_profile(username):
+    """the public profile of a user, cached per username until the user,
+    their reviews, rooms or experiences, or the reviews of their rooms change
+    (see 'users.signals')
+
+    Keyword arguments:
+    username -- the username of the user
+    Return: the serialized profile, or None if no user has the username
+    """
+
+    key = public_profile_cache_key(username)
+    profile = cache.get(key)
+
+    if profile is None:
+        user = get_profile_user(username)
+
+        if user is None:
+            return None
+
+        profile = PublicUserSerializer(user).data
+        cache.set(key, profile, CACHE_TIMEOUT)
+
+    return profile
+
+
+def clear_public_profiles(*usernames):
+    """drop the cached profiles of the users
+
+    they are dropped right away and again after the commit,
+    so a profile read while the transaction is running is not kept
+    """
+
+    keys = [public_profile_cache_key(username) for username in usernames if username]
+
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -1,3 +1,4 @@
+from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer
 from .models import User
 
@@ -31,7 +32,15 @@ class PrivateUserSerializer(ModelSerializer):
 
 
 class PublicUserSerializer(ModelSerializer):
-    """for a Public user profile"""
+    """for a Public user profile
+    the stats should be annotated, see 'users.profiles.get_profile_user'"""
+
+    total_reviews = serializers.IntegerField(source="review_total", read_only=True)
+    total_rooms = serializers.IntegerField(source="room_total", read_only=True)
+    total_experiences = serializers.IntegerField(
+        source="experience_total", read_only=True
+    )
+    host_rating = serializers.SerializerMethodField()
 
     class Meta:
         model = User
@@ -41,10 +50,10 @@ class PublicUserSerializer(ModelSerializer):
             "currency",
             "total_reviews",
             "total_rooms",
+            "total_experiences",
+            "host_rating",
         )
 
-    def get_total_reviews(self, user):
-        return user.total_reviews()
-
-    def get_total_rooms(self, user):
-        return user.total_rooms()
+    # rounded like 'Room.rating', 0 without a review
+    def get_host_rating(self, user):
+        return round(user.host_rating or 0, 2)
@@ -0,0 +1,97 @@
+from django.db.models import Q
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from experiences.models import Experience
+from reviews.models import Review
+from rooms.models import Room
+from .models import User
+from .profiles import clear_public_profiles
+
+
+def clear_profiles_of(*user_pks):
+    """drop the cached profiles of the users with the pks, with one query for their usernames"""
+
+    user_pks = [pk for pk in user_pks if pk is not None]
+
+    if user_pks:
+        clear_public_profiles(
+            *User.objects.filter(pk__in=user_pks).values_list("username", flat=True)
+        )
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, update_fields=None, **kwargs):
+    # the profile cached under the previous username is dropped too
+    # (not looked up for the saves of other fields, ex) 'last_login')
+    if update_fields is not None and "username" not in update_fields:
+        return
+
+    if instance.pk:
+        instance._previous_username = (
+            User.objects.filter(pk=instance.pk)
+            .values_list("username", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def clear_user_profile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    clear_public_profiles(
+        instance.username, getattr(instance, "_previous_username", None)
+    )
+
+
+@receiver(pre_save, sender=Room)
+def remember_owner(sender, instance, update_fields=None, **kwargs):
+    # the profile of the previous owner is dropped too, when the room changes hands
+    # (not looked up for the saves of other fields)
+    if update_fields is not None and "owner" not in update_fields:
+        return
+
+    if instance.pk:
+        instance._previous_owner_id = (
+            Room.objects.filter(pk=instance.pk).values_list("owner", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def clear_owner_profile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    clear_profiles_of(instance.owner_id, getattr(instance, "_previous_owner_id", None))
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def clear_host_profile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    clear_profiles_of(instance.host_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def clear_reviewer_and_host_profiles(sender, instance, raw=False, **kwargs):
+    # the reviews written by the reviewer, and the host rating of the owner of the room
+    # (and of the owner of the previous room, when the review is moved, see 'reviews.signals')
+    if raw:
+        return
+
+    previous = getattr(instance, "_previous", None)
+    room_pks = [instance.room_id, previous[0] if previous else None]
+
+    filters = Q(pk=instance.user_id)
+    room_pks = [pk for pk in room_pks if pk is not None]
+    if room_pks:
+        filters |= Q(rooms__in=room_pks)
+
+    clear_public_profiles(
+        *User.objects.filter(filters).values_list("username", flat=True)
+    )
@@ -1,3 +1,205 @@
-from django.test import TestCase
+from datetime import time
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory, APITestCase
+from common.testing import QueryCountGuard, create_room
+from config.authentication import TokenAuthentication, token_cache
+from experiences.models import Experience
+from reviews.models import Review
+from reviews.paginations import ReviewPagination
+from rooms.models import Amenity
+from rooms.paginations import HostRoomPagination
+from .models import User, Token
 
-# Create your tests here.
+
+class TestTokens(APITestCase):
+    URL = "/api/v1/users/tokens"
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create(username="user")
+        self.user.set_password("password")
+        self.user.save()
+
+    def issue(self):
+        response = self.client.post(
+            self.URL,
+            {"username": "user", "password": "password"},
+        )
+        return response.json()["token"]
+
+    def test_token_authentication(self):
+        key = self.issue()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+
+        self.assertFalse(Token.objects.filter(digest=key).exists())
+        self.assertEqual(self.client.get("/api/v1/users/me").json()["username"], "user")
+
+        # the user is cached with the token
+        with self.assertNumQueries(0):
+            self.client.get("/api/v1/users/me")
+
+    def test_cached_user_not_shared(self):
+        key = self.issue()
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Token {key}")
+
+        user, token = TokenAuthentication().authenticate(request)
+        user.name = "changed by a request"
+
+        with self.assertNumQueries(0):
+            cached_user, cached_token = TokenAuthentication().authenticate(request)
+
+        self.assertIsNot(cached_user, user)
+        self.assertEqual(cached_user.name, "")
+        self.assertEqual(cached_token.user, cached_user)
+
+    def test_revoke_token(self):
+        key = self.issue()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        self.client.get("/api/v1/users/me")
+
+        self.assertEqual(self.client.delete(self.URL).status_code, 204)
+        self.assertEqual(self.client.get("/api/v1/users/me").status_code, 403)
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+        self.assertEqual(self.client.get("/api/v1/users/me").status_code, 403)
+
+    def test_anonymous_forbidden(self):
+        # 403 without 'WWW-Authenticate', as before the token authentication
+        response = self.client.get("/api/v1/users/me")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn("WWW-Authenticate", response)
+
+
+class TestUserQueries(QueryCountGuard, APITestCase):
+    def setUp(self):
+        self.host = User.objects.create(username="host", is_host=True)
+        self.amenity = Amenity.objects.create(name="Wifi")
+
+    def create_room(self, index):
+        room = create_room(self.host, name=f"Room {index}")
+        room.amenities.add(self.amenity)
+        Review.objects.create(user=self.host, room=room, payload="good", rating=4)
+        return room
+
+    def test_host_rooms(self):
+        self.assertQueriesDontGrow(
+            "/api/v1/users/@host/rooms", self.create_room, HostRoomPagination
+        )
+
+    def test_host_rooms_totals(self):
+        room = self.create_room(0)
+        room.amenities.add(Amenity.objects.create(name="Kitchen"))
+        Review.objects.create(user=self.host, room=room, payload="bad", rating=1)
+
+        data = self.client.get("/api/v1/users/@host/rooms").json()["results"][0]
+
+        self.assertEqual(data["total_amenities"], 2)
+        self.assertEqual(data["total_reviews"], 2)
+        self.assertEqual(data["rating"], 2.5)
+
+    def test_user_reviews(self):
+        self.assertQueriesDontGrow(
+            "/api/v1/users/@host/reviews", self.create_room, ReviewPagination
+        )
+
+
+class TestPublicUser(APITestCase):
+    URL = "/api/v1/users/@host"
+
+    def setUp(self):
+        cache.clear()
+        self.host = User.objects.create(username="host", is_host=True)
+        self.guest = User.objects.create(username="guest")
+        self.room = create_room(self.host)
+        Experience.objects.create(
+            name="Experience",
+            host=self.host,
+            price=10,
+            address="address",
+            start=time(10),
+            end=time(12),
+            description="description",
+        )
+        Review.objects.create(user=self.guest, room=self.room, payload="good", rating=5)
+        Review.objects.create(user=self.host, room=self.room, payload="ok", rating=2)
+
+    def test_public_user(self):
+        data = self.client.get(self.URL).json()
+
+        self.assertEqual(data["total_reviews"], 1)
+        self.assertEqual(data["total_rooms"], 1)
+        self.assertEqual(data["total_experiences"], 1)
+        self.assertEqual(data["host_rating"], 3.5)
+
+        data = self.client.get("/api/v1/users/@guest").json()
+
+        self.assertEqual(data["total_reviews"], 1)
+        self.assertEqual(data["total_rooms"], 0)
+        self.assertEqual(data["host_rating"], 0)
+
+    def test_public_user_not_found(self):
+        self.assertEqual(self.client.get("/api/v1/users/@nobody").status_code, 404)
+
+    def test_public_user_query_count(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.URL)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.URL)
+
+    def test_public_user_invalidation(self):
+        self.client.get(self.URL)
+        self.client.get("/api/v1/users/@guest")
+
+        # a review of the room of the host, by the guest
+        Review.objects.create(user=self.guest, room=self.room, payload="bad", rating=1)
+
+        self.assertAlmostEqual(self.client.get(self.URL).json()["host_rating"], 2.67)
+        self.assertEqual(
+            self.client.get("/api/v1/users/@guest").json()["total_reviews"], 2
+        )
+
+        self.room.delete()
+
+        data = self.client.get(self.URL).json()
+        self.assertEqual(data["total_rooms"], 0)
+        self.assertEqual(data["host_rating"], 0)
+
+        self.host.username = "new-host"
+        self.host.save()
+
+        self.assertEqual(self.client.get(self.URL).status_code, 404)
+
+    def test_public_user_room_moved(self):
+        other_host = User.objects.create(username="other-host", is_host=True)
+        self.client.get(self.URL)
+        self.client.get("/api/v1/users/@other-host")
+
+        # the room of the host is given to the other host
+        self.room.refresh_from_db()
+        self.room.owner = other_host
+        self.room.save()
+
+        data = self.client.get(self.URL).json()
+        self.assertEqual(data["total_rooms"], 0)
+        self.assertEqual(data["host_rating"], 0)
+        data = self.client.get("/api/v1/users/@other-host").json()
+        self.assertEqual(data["total_rooms"], 1)
+        self.assertEqual(data["host_rating"], 3.5)
+
+    def test_public_user_review_moved(self):
+        other_host = User.objects.create(username="other-host", is_host=True)
+        other_room = create_room(other_host, name="Other Room")
+        self.client.get(self.URL)
+
+        # the review of the guest moves from the room of the host
+        review = Review.objects.get(user=self.guest)
+        review.room = other_room
+        review.save()
+
+        self.assertEqual(self.client.get(self.URL).json()["host_rating"], 2)
+        self.assertEqual(
+            self.client.get("/api/v1/users/@other-host").json()["host_rating"], 5
+        )
@@ -8,6 +8,7 @@ from .views import (
     ChangePassword,
     LogIn,
     LogOut,
+    Tokens,
 )
 
 urlpatterns = [
@@ -16,6 +17,7 @@ urlpatterns = [
     path("change-password", ChangePassword.as_view()),
     path("log-in", LogIn.as_view()),
     path("log-out", LogOut.as_view()),
+    path("tokens", Tokens.as_view()),
     path("@<str:username>", PublicUser.as_view()),
     path("@<str:username>/reviews", UserReviews.as_view()),
     path("@<str:username>/rooms", HostRooms.as_view()),
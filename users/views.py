@@ -1,4 +1,5 @@
 from django.contrib.auth import authenticate, login, logout
+from django.db.models import Count
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status, generics
@@ -11,8 +12,9 @@ from reviews.serializers import ReviewSerializer
 from rooms.models import Room
 from rooms.paginations import HostRoomPagination
 from rooms.serializers import HostRoomSerializer
-from .serializers import PrivateUserSerializer, PublicUserSerializer
-from .models import User
+from .serializers import PrivateUserSerializer
+from .profiles import get_public_profile
+from .models import User, Token
 
 
 class Me(APIView):
@@ -98,14 +100,15 @@ class PublicUser(APIView):
         Keyword arguments:
         request -- the request from user
         username -- the username to display
-        Return: the user with username
+        Return: the user with username, and the stats of the user
         """
-        try:
-            user = User.objects.get(username=username)
-        except:
+
+        # cached per username, see 'users.profiles'
+        profile = get_public_profile(username)
+        if profile is None:
             raise NotFound
-        serializer = PublicUserSerializer(user)
-        return Response(serializer.data)
+
+        return Response(profile)
 
 
 class UserReviews(generics.ListAPIView):
@@ -115,10 +118,9 @@ class UserReviews(generics.ListAPIView):
     def get_queryset(self):
         username = self.kwargs.get("username")
         if User.objects.filter(username=username).exists():
-            queryset = (
-                Review.objects.filter(user__username=username)
-                .all()
-                .order_by("-created_at")
+            # the ordering is applied by the cursor pagination
+            queryset = Review.objects.filter(user__username=username).select_related(
+                "user"
             )
             return queryset
         else:
@@ -132,8 +134,11 @@ class HostRooms(generics.ListAPIView):
     def get_queryset(self):
         username = self.kwargs.get("username")
         if User.objects.filter(username=username).exists():
-            queryset = Room.objects.filter(owner__username=username).order_by(
-                "-created_at"
+            # the ordering is applied by the cursor pagination
+            # the totals of the serializer in the same query,
+            # the reviews are counted in the stored aggregates of the rooms
+            queryset = Room.objects.filter(owner__username=username).annotate(
+                amenity_count=Count("amenities", distinct=True)
             )
             return queryset
         else:
@@ -214,3 +219,44 @@ class LogOut(APIView):
 
         logout(request)
         return Response({"ok": "Bye!"})
+
+
+class Tokens(APIView):
+
+    """APIView for 'POST/DELETE /users/tokens' request handler for the token authentication"""
+
+    def post(self, request):
+        """POST request handler for issuing a token
+
+        Keyword arguments:
+        request -- the request from user with 'username' and 'password'
+        Return: the token, to send as 'Authorization: Token <token>'
+        """
+
+        username = request.data.get("username")
+        password = request.data.get("password")
+
+        if not username or not password:
+            raise ParseError
+
+        user = authenticate(request, username=username, password=password)
+
+        if not user:
+            return Response({"error": "wrong password"})
+
+        token, key = Token.issue(user)
+        return Response({"token": key})
+
+    def delete(self, request):
+        """DELETE request handler for revoking the token used by the request
+
+        Keyword arguments:
+        request -- the request authenticated by the token
+        Return: HTTP_204_NO_CONTENT
+        """
+
+        if not isinstance(request.auth, Token):
+            raise NotFound
+
+        request.auth.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
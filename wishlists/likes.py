@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.db import transaction
+from .models import Wishlist
+
+CACHE_TIMEOUT = 60 * 60
+
+
+def liked_rooms_cache_key(user_pk):
+    return f"wishlists:liked-rooms:{user_pk}"
+
+
+def get_liked_room_pks(request):
+    """the pks of the rooms in any wishlist of the user who requests
+
+    loaded with one query on the 'wishlists_wishlist_rooms' table, then kept
+    on the request and in the cache, so 'is_liked' is a set lookup for every room
+
+    Keyword arguments:
+    request -- the request from user
+    Return: the set of the room pks (empty for an anonymous user)
+    """
+
+    user = request.user
+
+    if not user.is_authenticated:
+        return frozenset()
+
+    liked_room_pks = getattr(request, "_liked_room_pks", None)
+    if liked_room_pks is not None:
+        return liked_room_pks
+
+    key = liked_rooms_cache_key(user.pk)
+    liked_room_pks = cache.get(key)
+
+    if liked_room_pks is None:
+        liked_room_pks = frozenset(
+            Wishlist.rooms.through.objects.filter(
+                wishlist__user=user,
+            ).values_list("room_id", flat=True)
+        )
+        cache.set(key, liked_room_pks, CACHE_TIMEOUT)
+
+    request._liked_room_pks = liked_room_pks
+    return liked_room_pks
+
+
+async def aget_liked_room_pks(user):
+    """'get_liked_room_pks' for the async views, sharing the same cache
+
+    Keyword arguments:
+    user -- the user who requests (None for an anonymous user)
+    Return: the set of the room pks (empty for an anonymous user)
+    """
+
+    if user is None:
+        return frozenset()
+
+    key = liked_rooms_cache_key(user.pk)
+    liked_room_pks = await cache.aget(key)
+
+    if liked_room_pks is None:
+        liked_room_pks = frozenset(
+            [
+                room_pk
+                async for room_pk in Wishlist.rooms.through.objects.filter(
+                    wishlist__user=user,
+                ).values_list("room_id", flat=True)
+            ]
+        )
+        await cache.aset(key, liked_room_pks, CACHE_TIMEOUT)
+
+    return liked_room_pks
+
+
+def clear_liked_rooms(*user_pks):
+    """forget the liked rooms of the users, right away and again after the commit,
+    so the likes read by another request while the transaction is running are not kept
+    """
+
+    keys = [liked_rooms_cache_key(user_pk) for user_pk in user_pks]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -1,3 +1,4 @@
+from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer
 from .models import Wishlist
 from rooms.serializers import RoomListSerializer
@@ -16,3 +17,26 @@ class WishlistSeralizer(ModelSerializer):
             "rooms",
             # "experiences",
         )
+
+
+class WishlistSummarySerializer(ModelSerializer):
+    """The light serializer of Wishlist, without the rooms
+    'total_rooms' and 'total_experiences' should be annotated,
+    and the cover photos given as {wishlist pk: [photo urls]} in the context"""
+
+    total_rooms = serializers.IntegerField(read_only=True)
+    total_experiences = serializers.IntegerField(read_only=True)
+    covers = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Wishlist
+        fields = (
+            "pk",
+            "name",
+            "total_rooms",
+            "total_experiences",
+            "covers",
+        )
+
+    def get_covers(self, wishlist):
+        return self.context["covers"].get(wishlist.pk, [])
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, m2m_changed
+from django.dispatch import receiver
+from .likes import clear_liked_rooms
+from .models import Wishlist
+
+
+@receiver(m2m_changed, sender=Wishlist.rooms.through)
+def clear_liked_rooms_on_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """drop the cached liked rooms of the users whose wishlists changed"""
+
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    # wishlist.rooms.add(...)
+    if not reverse:
+        clear_liked_rooms(instance.user_id)
+        return
+
+    # room.wishlists.add(...)
+    if action == "pre_clear":
+        wishlists = instance.wishlists.all()
+    else:
+        wishlists = Wishlist.objects.filter(pk__in=pk_set)
+
+    clear_liked_rooms(*wishlists.values_list("user", flat=True).distinct())
+
+
+@receiver(post_delete, sender=Wishlist)
+def clear_liked_rooms_on_delete(sender, instance, **kwargs):
+    clear_liked_rooms(instance.user_id)
@@ -1,3 +1,288 @@
-from django.test import TestCase
+import datetime
+import time
+from django.core.cache import cache
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+from common.testing import QueryCountGuard, create_room
+from experiences.models import Experience
+from medias.models import Photo
+from rooms.paginations import RoomPagination
+from users.models import User
+from .likes import liked_rooms_cache_key
+from .models import Wishlist
 
-# Create your tests here.
+
+class TestLikedRooms(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="user")
+        self.rooms = [create_room(self.user, name=f"Room {i}") for i in range(3)]
+        self.wishlist = Wishlist.objects.create(name="Trip", user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def liked(self):
+        response = self.client.get("/api/v1/rooms/")
+        return {room["pk"] for room in response.json()["results"] if room["is_liked"]}
+
+    def test_is_liked(self):
+        self.assertEqual(self.liked(), set())
+
+        self.client.put(
+            f"/api/v1/wishlists/{self.wishlist.pk}/rooms/{self.rooms[0].pk}"
+        )
+        self.assertEqual(self.liked(), {self.rooms[0].pk})
+
+        self.client.put(
+            f"/api/v1/wishlists/{self.wishlist.pk}/rooms/{self.rooms[0].pk}"
+        )
+        self.assertEqual(self.liked(), set())
+
+    def test_rooms_etag_follows_likes(self):
+        response = self.client.get("/api/v1/rooms/")
+
+        self.client.put(
+            f"/api/v1/wishlists/{self.wishlist.pk}/rooms/{self.rooms[0].pk}"
+        )
+        response = self.client.get(
+            "/api/v1/rooms/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            self.rooms[0].pk,
+            {room["pk"] for room in response.json()["results"] if room["is_liked"]},
+        )
+
+    def test_liked_since(self):
+        # no 'Last-Modified', a like doesn't change the 'updated_at' of the rooms
+        since = http_date(time.time() + 60)
+        room_url = f"/api/v1/rooms/{self.rooms[0].pk}"
+        toggle_url = f"/api/v1/wishlists/{self.wishlist.pk}/rooms/{self.rooms[0].pk}"
+        self.assertNotIn("Last-Modified", self.client.get(room_url))
+        self.assertNotIn("Last-Modified", self.client.get("/api/v1/rooms/"))
+
+        self.client.put(toggle_url)
+        response = self.client.get(room_url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_liked"])
+
+        self.client.put(toggle_url)
+        response = self.client.get("/api/v1/rooms/", HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any(room["is_liked"] for room in response.json()["results"]))
+
+    def test_cleared_after_commit(self):
+        key = liked_rooms_cache_key(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wishlist.rooms.add(self.rooms[0])
+            # read by another request before the commit
+            cache.set(key, frozenset())
+
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(self.liked(), {self.rooms[0].pk})
+
+    def test_is_liked_anonymous(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(f"/api/v1/rooms/{self.rooms[0].pk}")
+
+        self.assertFalse(response.json()["is_liked"])
+
+
+class TestWishlistRooms(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user")
+        self.rooms = [create_room(self.user, name=f"Room {i}") for i in range(3)]
+        self.wishlist = Wishlist.objects.create(name="Trip", user=self.user)
+        self.url = f"/api/v1/wishlists/{self.wishlist.pk}/rooms"
+        self.client.force_authenticate(self.user)
+
+    def test_add_and_remove(self):
+        pks = [room.pk for room in self.rooms]
+
+        response = self.client.post(self.url, {"add": pks}, format="json")
+        self.assertEqual(response.json()["added"], pks)
+        self.assertEqual(self.wishlist.rooms.count(), 3)
+
+        response = self.client.post(
+            self.url,
+            {"add": pks[:1], "remove": pks[1:]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(self.wishlist.rooms.values_list("pk", flat=True)), pks[:1]
+        )
+
+    def test_wishlists_etag(self):
+        etag = self.client.get("/api/v1/wishlists/")["ETag"]
+
+        self.client.post(self.url, {"add": [self.rooms[0].pk]}, format="json")
+        response = self.client.get("/api/v1/wishlists/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()[0]["rooms"]), 1)
+
+        # a change of a room of the wishlist
+        etag = response["ETag"]
+        self.rooms[0].name = "Renamed"
+        self.rooms[0].save()
+        response = self.client.get("/api/v1/wishlists/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.json()[0]["rooms"][0]["name"], "Renamed")
+
+    def test_missing_ids(self):
+        response = self.client.post(
+            self.url,
+            {"add": [self.rooms[0].pk, 9999]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("9999", response.json()["detail"])
+        self.assertEqual(self.wishlist.rooms.count(), 0)
+
+    def test_rooms_page(self):
+        self.wishlist.rooms.add(*self.rooms)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(len(response.json()["results"]), 3)
+        self.assertTrue(response.json()["results"][0]["is_liked"])
+
+
+class TestWishlistExperiences(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user")
+        self.experiences = [
+            Experience.objects.create(
+                name=f"Experience {i}",
+                host=self.user,
+                price=10,
+                address="address",
+                start=datetime.time(10),
+                end=datetime.time(12),
+                description="description",
+            )
+            for i in range(3)
+        ]
+        self.wishlist = Wishlist.objects.create(name="Trip", user=self.user)
+        self.url = f"/api/v1/wishlists/{self.wishlist.pk}/experiences"
+        self.client.force_authenticate(self.user)
+
+    def test_add_and_remove(self):
+        pks = [experience.pk for experience in self.experiences]
+
+        response = self.client.post(self.url, {"add": pks}, format="json")
+        self.assertEqual(response.json()["added"], pks)
+        self.assertEqual(self.wishlist.experiences.count(), 3)
+
+        response = self.client.post(
+            self.url,
+            {"add": pks[:1], "remove": pks[1:]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["removed"], pks[1:])
+        self.assertEqual(
+            list(self.wishlist.experiences.values_list("pk", flat=True)), pks[:1]
+        )
+
+    def test_summary_etag(self):
+        etag = self.client.get("/api/v1/wishlists/", {"summary": "true"})["ETag"]
+
+        self.client.post(self.url, {"add": [self.experiences[0].pk]}, format="json")
+        response = self.client.get(
+            "/api/v1/wishlists/", {"summary": "true"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["total_experiences"], 1)
+
+    def test_missing_ids(self):
+        response = self.client.post(
+            self.url,
+            {"add": [self.experiences[0].pk], "remove": [9999]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("9999", response.json()["detail"])
+        self.assertEqual(self.wishlist.experiences.count(), 0)
+
+    def test_add_and_remove_same_ids(self):
+        pk = self.experiences[0].pk
+        response = self.client.post(
+            self.url, {"add": [pk], "remove": [pk]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_users_wishlist(self):
+        self.client.force_authenticate(User.objects.create(username="other"))
+        response = self.client.post(
+            self.url, {"add": [self.experiences[0].pk]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.wishlist.experiences.count(), 0)
+
+
+class TestWishlistSummary(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user")
+        self.client.force_authenticate(self.user)
+
+    def test_summary(self):
+        for i in range(2):
+            wishlist = Wishlist.objects.create(name=f"Trip {i}", user=self.user)
+            for j in range(5):
+                room = create_room(self.user, name=f"Room {j}")
+                room.photos.create(file=f"https://example.com/{i}/{j}.jpg")
+                wishlist.rooms.add(room)
+
+        # wishlists, through rows, photos (the validators are the versions in the cache)
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/v1/wishlists/", {"summary": "true"})
+
+        summary = response.json()
+        self.assertEqual(summary[0]["total_rooms"], 5)
+        self.assertEqual(summary[0]["total_experiences"], 0)
+        self.assertEqual(
+            summary[0]["covers"],
+            [f"https://example.com/0/{j}.jpg" for j in (4, 3, 2)],
+        )
+
+
+class TestWishlistQueries(QueryCountGuard, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user")
+        self.wishlist = Wishlist.objects.create(name="Trip", user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def create_room(self, index):
+        room = create_room(self.user, name=f"Room {index}")
+        Photo.objects.create(
+            file="https://example.com/photo.jpg",
+            description="photo",
+            room=room,
+        )
+        return room
+
+    def create_wishlist(self, index):
+        wishlist = Wishlist.objects.create(name=f"Wishlist {index}", user=self.user)
+        wishlist.rooms.add(self.create_room(index), self.create_room(index))
+
+    def test_wishlists(self):
+        self.assertQueriesDontGrow("/api/v1/wishlists/", self.create_wishlist)
+
+    def test_wishlists_summary(self):
+        self.assertQueriesDontGrow(
+            "/api/v1/wishlists/?summary=true", self.create_wishlist
+        )
+
+    def test_wishlist_rooms(self):
+        def add_room(index):
+            self.wishlist.rooms.add(self.create_room(index))
+
+        self.assertQueriesDontGrow(
+            f"/api/v1/wishlists/{self.wishlist.pk}/rooms", add_room, RoomPagination
+        )
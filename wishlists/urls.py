@@ -1,8 +1,16 @@
 from django.urls import path
-from .views import Wishlists, WishlistDetail, WishlistToogle
+from .views import (
+    Wishlists,
+    WishlistDetail,
+    WishlistToogle,
+    WishlistRooms,
+    WishlistExperiences,
+)
 
 urlpatterns = [
     path("", Wishlists.as_view()),
     path("<int:pk>", WishlistDetail.as_view()),
+    path("<int:pk>/rooms", WishlistRooms.as_view()),
+    path("<int:pk>/experiences", WishlistExperiences.as_view()),
     path("<int:pk>/rooms/<int:room_pk>", WishlistToogle.as_view()),
 ]
@@ -1,11 +1,38 @@
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ParseError
 from rest_framework.status import HTTP_200_OK
 from rooms.models import Room
+from rooms.paginations import RoomPagination
+from rooms.serializers import RoomListSerializer
+from medias.models import Photo
+from experiences.models import Experience
 from .models import Wishlist
-from .serializers import WishlistSeralizer
+from .serializers import WishlistSeralizer, WishlistSummarySerializer
+from common.conditional import conditional_get, namespace_validators
+
+
+def count_items(field):
+    """a subquery counting the rows of a many to many field of the wishlist
+    (two 'Count's on two joins would multiply the rows)"""
+
+    through = getattr(Wishlist, field).through
+
+    return Coalesce(
+        Subquery(
+            through.objects.filter(wishlist=OuterRef("pk"))
+            .order_by()
+            .values("wishlist")
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
 
 
 class Wishlists(APIView):
@@ -13,9 +40,54 @@ class Wishlists(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    # the number of the cover photos of a wishlist in the summary
+    COVERS = 3
+
+    def get_validators(self, request):
+        # the rooms and their photos are nested in the wishlists of the user,
+        # the versions are bumped by their changes (see 'common.signals')
+        return namespace_validators(
+            "rooms", "room-list", "wishlists", f"likes:{request.user.pk}"
+        )
+
+    def get_covers(self, wishlists):
+        """the first photo of the latest 'COVERS' rooms of every wishlist, with two queries
+        (the rows are cut in python, Django 4.1 can't filter on a window function)
+
+        Keyword arguments:
+        wishlists -- the wishlists
+        Return: {wishlist pk: [photo urls]}
+        """
+
+        rooms = {}
+        for wishlist_pk, room_pk in (
+            Wishlist.rooms.through.objects.filter(wishlist__in=wishlists)
+            .order_by("wishlist", "-pk")
+            .values_list("wishlist", "room")
+        ):
+            if len(rooms.setdefault(wishlist_pk, [])) < self.COVERS:
+                rooms[wishlist_pk].append(room_pk)
+
+        photos = {}
+        for room_pk, file in (
+            Photo.objects.filter(room__in={pk for pks in rooms.values() for pk in pks})
+            .order_by("room", "pk")
+            .values_list("room", "file")
+        ):
+            photos.setdefault(room_pk, file)
+
+        return {
+            wishlist_pk: [photos[pk] for pk in room_pks if pk in photos]
+            for wishlist_pk, room_pks in rooms.items()
+        }
+
+    @conditional_get(get_validators)
     def get(self, request):
         """GET /wishilists
             Displaying all 'wishlists' that a user created
+            GET /wishlists?summary=true
+            Displaying the numbers of the rooms/experiences and the cover photos instead of the rooms,
+            the rooms are fetched with 'GET /wishlists/{ID of a wishlist}/rooms'
 
         Keyword arguments:
         self --
@@ -23,7 +95,24 @@ class Wishlists(APIView):
         Return: the response with the data of wishlist serializer
         """
 
-        all_wishilists = Wishlist.objects.filter(user=request.user)
+        if request.query_params.get("summary") == "true":
+            wishlists = list(
+                Wishlist.objects.filter(user=request.user).annotate(
+                    total_rooms=count_items("rooms"),
+                    total_experiences=count_items("experiences"),
+                )
+            )
+            serializer = WishlistSummarySerializer(
+                wishlists,
+                many=True,
+                context={"covers": self.get_covers(wishlists)},
+            )
+
+            return Response(serializer.data)
+
+        all_wishilists = Wishlist.objects.filter(user=request.user).prefetch_related(
+            "rooms__photos"
+        )
         serializer = WishlistSeralizer(
             all_wishilists,
             many=True,
@@ -45,7 +134,7 @@ class Wishlists(APIView):
 
         if serializer.is_valid():
             wishlist = serializer.save(user=request.user)
-            serializer = WishlistSeralizer(wishlist)
+            serializer = WishlistSeralizer(wishlist, context={"request": request})
             return Response(serializer.data)
         else:
             return Response(serializer.errors)
@@ -78,6 +167,12 @@ class WishlistDetail(APIView):
         except Wishlist.DoesNotExist:
             raise NotFound
 
+    def get_validators(self, request, pk):
+        return namespace_validators(
+            "rooms", "room-list", "wishlists", f"likes:{request.user.pk}"
+        )
+
+    @conditional_get(get_validators)
     def get(self, request, pk):
         """handling the request about 'GET /wishlists/{ID of a wishlist}'
 
@@ -120,7 +215,7 @@ class WishlistDetail(APIView):
 
         if serializer.is_valid():
             wishlist = serializer.save()
-            serializer = WishlistSeralizer(wishlist)
+            serializer = WishlistSeralizer(wishlist, context={"request": request})
             return Response(serializer.data)
 
         else:
@@ -184,3 +279,134 @@ class WishlistToogle(APIView):
             wishlist.rooms.add(room)
 
         return Response(status=HTTP_200_OK)
+
+
+class WishlistItems(APIView):
+
+    """The base API view for adding/removing many rooms/experiences to/from the wishlist at once
+       Handling requests for 'POST /wishlists/{ID of a wishlist}/{rooms or experiences}'
+       ex) POST /wishlists/1/rooms {"add": [1, 2, 3], "remove": [4]}
+
+    Keyword arguments:
+    model -- the model of the items (Room or Experience)
+    field -- the many to many field of the wishlist for the items
+    Return: None
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    model = None
+    field = None
+
+    def get_wishlist(self, pk, user):
+        try:
+            return Wishlist.objects.get(pk=pk, user=user)
+        except Wishlist.DoesNotExist:
+            raise NotFound
+
+    def get_pks(self, request, name):
+        """read a list of pks from the request data
+
+        Keyword arguments:
+        request -- the request that a user make
+        name -- 'add' or 'remove'
+        Return: the set of the pks
+        """
+
+        pks = request.data.get(name, [])
+
+        if not isinstance(pks, list):
+            raise ParseError(f"'{name}' should be a list of ids")
+
+        try:
+            return {int(pk) for pk in pks}
+        except (TypeError, ValueError):
+            raise ParseError(f"'{name}' should be a list of ids")
+
+    def post(self, request, pk):
+        """handling the request about 'POST /wishlists/{ID of a wishlist}/{rooms or experiences}'
+
+        Keyword arguments:
+        request -- the request that a user make with the 'add' and 'remove' lists of ids
+        pk -- the primary key or the requested wishlist
+        Return: the ids added and removed
+        """
+
+        wishlist = self.get_wishlist(pk, request.user)
+        add_pks = self.get_pks(request, "add")
+        remove_pks = self.get_pks(request, "remove")
+
+        if add_pks & remove_pks:
+            raise ParseError(
+                f"Can't add and remove the same ids: {sorted(add_pks & remove_pks)}"
+            )
+
+        # validate every id with one 'IN' query
+        found_pks = set(
+            self.model.objects.filter(pk__in=add_pks | remove_pks).values_list(
+                "pk",
+                flat=True,
+            )
+        )
+        missing_pks = (add_pks | remove_pks) - found_pks
+
+        if missing_pks:
+            raise ParseError(f"Not found: {sorted(missing_pks)}")
+
+        # add() and remove() write the through table with a single bulk insert / delete
+        with transaction.atomic():
+            items = getattr(wishlist, self.field)
+
+            if add_pks:
+                items.add(*add_pks)
+            if remove_pks:
+                items.remove(*remove_pks)
+
+        return Response(
+            {
+                "added": sorted(add_pks),
+                "removed": sorted(remove_pks),
+            }
+        )
+
+
+class WishlistRooms(WishlistItems):
+
+    """ex) GET /wishlists/1/rooms
+       ex) POST /wishlists/1/rooms {"add": [1, 2, 3], "remove": [4]}"""
+
+    model = Room
+    field = "rooms"
+
+    def get(self, request, pk):
+        """handling the request about 'GET /wishlists/{ID of a wishlist}/rooms'
+
+        Keyword arguments:
+        request -- the request that a user make
+        pk -- the primary key or the requested wishlist
+        Return: a page of the rooms of the wishlist
+        """
+
+        wishlist = self.get_wishlist(pk, request.user)
+
+        paginator = RoomPagination()
+        page = paginator.paginate_queryset(
+            wishlist.rooms.prefetch_related("photos"),
+            request,
+            view=self,
+        )
+
+        serializer = RoomListSerializer(
+            page,
+            many=True,
+            context={"request": request},
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+
+class WishlistExperiences(WishlistItems):
+
+    """ex) POST /wishlists/1/experiences {"add": [1, 2], "remove": []}"""
+
+    model = Experience
+    field = "experiences"